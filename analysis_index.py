@@ -1,18 +1,48 @@
+import os
 import re
+import errno
+import sys
 import time
+import threading
 import json
+import logging
+import gc
+import hashlib
+import queue
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from functools import lru_cache
+from html import escape as _html_escape
+from urllib.parse import urljoin, urlparse, urlsplit
 from typing import Any, Optional, Dict, List, Tuple, Set, TYPE_CHECKING
 
 # 预编译常用正则，降低重复编译开销
 _RE_NUM_HTML_TAIL = re.compile(r'(\d+)\.html$', re.IGNORECASE)
+# 字符集探测（响应头 / <meta>）
+_RE_HEADER_CHARSET = re.compile(r'charset\s*=\s*([A-Za-z0-9_\-]+)', re.IGNORECASE)
+_RE_META_CHARSET = re.compile(br'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_\-]+)\s*["\']?', re.IGNORECASE)
+_RE_META_CONTENT_CHARSET = re.compile(br'<meta[^>]+content=["\'][^"]*charset\s*=\s*([A-Za-z0-9_\-]+)[^"\']*["\']', re.IGNORECASE)
+# <meta> 字符集声明只在文档头部查找（HTML 规范的预扫描范围为 1024 字节，这里留足余量）
+_META_SNIFF_BYTES = 4096
 _RE_CHAPTER_CONTAINER_HINT = re.compile(r'全部章节|全部章|全部目录', re.IGNORECASE)
 _RE_ANCHOR_IN_UL = re.compile(r'<a\s+[^>]*href="(\d+\.html)"[^>]*>([^<]+)</a>', re.IGNORECASE)
 _RE_TITLE_CHAPNUM = re.compile(r'第\s*([0-9０-９零〇一二三四五六七八九十百千万]+)\s*[章掌回集卷]', re.IGNORECASE)
 _RE_NAV_PATH = re.compile(r'/sort/|/author/|/fullbook/|/mybook|/cover/|/index|/class\\d+-|/quanben|/top|/dll|/user/', re.IGNORECASE)
 # 分页页匹配（常见于目录分页，如 index_2.html / list_2.html）
 _RE_PAGINATION = re.compile(r'(?:^|/)(?:index|list)_(\d+)\.html$', re.IGNORECASE)
+# 章节号解析：纯数字判定与标题中的宽松数字
+_RE_ALL_DIGITS = re.compile(r'\d+')
+_RE_LOOSE_NUM = re.compile(r'(?<!\d)(\d{1,6})(?!\d)')
+# 标题/文本清洗（目录解析时每个章节条目都会调用）
+_RE_CTRL_SPACES = re.compile(r'[\r\t\xa0]+')
+_RE_TITLE_TYPO_PREFIX = re.compile(r'^(底|都)(\s*[零〇一二三四五六七八九十百千万0-9]+)')
+_RE_TITLE_TYPO_ZHANG = re.compile(r'(第\s*[零〇一二三四五六七八九十百千万0-9]+\s*)[张璋漳仗中钟衷]')
+_RE_WHITESPACE = re.compile(r'\s+')
+# 章节页 <title> 去掉 “ - 书名 - 站名” 之类的后缀
+_RE_TITLE_TAIL = re.compile(r"\s*[-_—|].*$")
+# 目录页 .html 链接计数（估算章节数量）
+_RE_HTML_HREF = re.compile(r'href="[^"]*\.html"', re.IGNORECASE)
+# 全角数字 -> 半角数字（str.translate 在 C 层逐码点替换）
+_FULLWIDTH_DIGITS = str.maketrans('０１２３４５６７８９', '0123456789')
 
 # 站点规则表与工具
 RULES: Dict[str, Dict[str, Any]] = {
@@ -122,17 +152,36 @@ except Exception as e:
     # 在使用组件前请确保安装 requests 和 beautifulsoup4
     raise RuntimeError("请先安装 requests 和 beautifulsoup4: pip install requests beautifulsoup4 lxml") from e
 
-# 尝试导入Qt相关库，用于线程处理
+# 可选：orjson 序列化/解析速度远快于标准库 json（书库 library.json 可达数 MB）
 try:
-    from PySide6.QtCore import QThread, Signal
+    import orjson
+    _ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    _ORJSON_AVAILABLE = False
+
+# 可选：章节页解析直接使用 lxml 树（C 实现），省去 BeautifulSoup 逐节点构建 Python 对象的开销；
+# 不可用或解析失败时回退到 BeautifulSoup 路径
+try:
+    from lxml import etree as _lxml_etree
+    _LXML_AVAILABLE = True
+except ImportError:
+    _lxml_etree = None
+    _LXML_AVAILABLE = False
+
+# 尝试导入Qt相关库，用于线程池任务
+try:
+    from PySide6.QtCore import QObject, QRunnable, Signal
 except ImportError:
     # 无 PySide6 环境：提供轻量桩类，避免类型检查/继承错误
-    class QThread:  # type: ignore[override]
+    class QObject:  # type: ignore[override]
+        def __init__(self, *args, **kwargs):
+            pass
+    class QRunnable:  # type: ignore[override]
         def __init__(self, *args, **kwargs):
             pass
-        def start(self): pass
         def run(self): pass
-        def quit(self): pass
+        def setAutoDelete(self, auto): pass
     class Signal:  # type: ignore[override]
         def __init__(self, *args, **kwargs):
             self._cbs = []
@@ -147,6 +196,24 @@ except ImportError:
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; WOW64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/108.0.5359.125 Safari/537.36"
 HEADERS = {"User-Agent": USER_AGENT}
 
+# 每个工作线程复用一个 requests.Session（Session 不保证跨线程安全）：
+# 线程池线程会被反复复用，同一站点的目录/章节/预取请求共享 keep-alive 连接，省去重复的 TCP/TLS 握手
+_thread_local = threading.local()
+
+
+def _http_session():
+    """获取当前线程的 HTTP 会话（首次调用时创建）"""
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = requests.Session()
+        session.headers.update(HEADERS)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=8)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _thread_local.session = session
+    return session
+
+
 def _bs(html):
     """
     安全构造 BeautifulSoup：
@@ -171,7 +238,7 @@ def fetch_html(url: str, timeout: int = 20, retries: int = 3) -> str:
     def _detect_charset_from_headers(ct: str) -> str:
         if not ct:
             return ""
-        m = re.search(r'charset\s*=\s*([A-Za-z0-9_\-]+)', ct, flags=re.IGNORECASE)
+        m = _RE_HEADER_CHARSET.search(ct)
         if not m:
             return ""
         enc = m.group(1).strip().lower()
@@ -180,10 +247,12 @@ def fetch_html(url: str, timeout: int = 20, retries: int = 3) -> str:
     def _detect_charset_from_meta(raw: bytes) -> str:
         try:
             # <meta charset="gbk"> 或 <meta http-equiv="Content-Type" content="text/html; charset=gbk">
-            m1 = re.search(br'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_\-]+)\s*["\']?', raw, flags=re.IGNORECASE)
+            # 只扫描文档头部；未声明时由下方 utf-8 -> gb18030 严格解码兜底
+            head = raw[:_META_SNIFF_BYTES]
+            m1 = _RE_META_CHARSET.search(head)
             if m1:
                 return m1.group(1).decode("ascii", "ignore").lower()
-            m2 = re.search(br'<meta[^>]+content=["\'][^"]*charset\s*=\s*([A-Za-z0-9_\-]+)[^"\']*["\']', raw, flags=re.IGNORECASE)
+            m2 = _RE_META_CONTENT_CHARSET.search(head)
             if m2:
                 return m2.group(1).decode("ascii", "ignore").lower()
         except Exception:
@@ -198,7 +267,7 @@ def fetch_html(url: str, timeout: int = 20, retries: int = 3) -> str:
 
     for attempt in range(1, retries + 1):
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=timeout)
+            resp = _http_session().get(url, timeout=timeout)
             resp.raise_for_status()
             raw = resp.content or b""
             if not raw:
@@ -239,15 +308,17 @@ def fetch_html(url: str, timeout: int = 20, retries: int = 3) -> str:
             time.sleep(0.3 * attempt)
 
 
-def _locate_full_chapter_index(url: str, html: str) -> str:
-    """从详情页 HTML 中定位完整章节目录页。找到则返回绝对URL，否则返回空字符串。"""
+def _locate_full_chapter_index(url: str, html: str, soup=None) -> str:
+    """从详情页 HTML 中定位完整章节目录页。找到则返回绝对URL，否则返回空字符串。
+    soup: 可选，已解析的文档树（传入时复用，避免重复解析）"""
     try:
         netloc = (urlparse(url).netloc or "").lower()
         path = (urlparse(url).path or "")
 
         # 优先从 meta/mobile-agent 或 OG 标签中读取移动目录地址
         try:
-            soup = _bs(html)
+            if soup is None:
+                soup = _bs(html)
             # og:novel:read_url / og:url
             for prop in ("og:novel:read_url", "og:url"):
                 m = soup.find("meta", attrs={"property": prop})
@@ -287,7 +358,7 @@ def _locate_full_chapter_index(url: str, html: str) -> str:
 def _clean_text(s: str) -> str:
     if not s:
         return ""
-    t = re.sub(r'[\r\t\xa0]+', ' ', s)
+    t = _RE_CTRL_SPACES.sub(' ', s)
     return " ".join(t.split()).strip()
 
 def _normalize_title(title: str) -> str:
@@ -296,11 +367,11 @@ def _normalize_title(title: str) -> str:
     if not t:
         return t
     # 常见错字归一：'底/都' -> '第'（仅限章节号位置前缀）
-    t = re.sub(r'^(底|都)(\s*[零〇一二三四五六七八九十百千万0-9]+)', r'第\2', t)
+    t = _RE_TITLE_TYPO_PREFIX.sub(r'第\2', t)
     # 将“第...张/璋/漳/仗/中/钟/衷”归一化为“章”，仅在模式位置替换
-    t = re.sub(r'(第\s*[零〇一二三四五六七八九十百千万0-9]+\s*)[张璋漳仗中钟衷]', r'\1章', t)
+    t = _RE_TITLE_TYPO_ZHANG.sub(r'\1章', t)
     # 统一空白
-    t = re.sub(r'\s+', ' ', t).strip()
+    t = _RE_WHITESPACE.sub(' ', t).strip()
     return t
 
 _CHN_DIGITS = {"零":0,"〇":0,"一":1,"二":2,"三":3,"四":4,"五":5,"六":6,"七":7,"八":8,"九":9}
@@ -331,18 +402,69 @@ def _chinese_numeral_to_int(s: str):
         return 10
     return total if total > 0 else None
 
+@lru_cache(maxsize=16)
+def _tag_open_re(tag: str):
+    """<tag 开头的大小写不敏感正则（按标签名缓存编译结果）"""
+    return re.compile("<" + re.escape(tag), re.IGNORECASE)
+
+def _may_contain_tag(html, tag: str) -> bool:
+    """源码预检（忽略大小写，如 <Dl）：确定不含 <tag 时返回 False，用于跳过整树查找；无法判定时返回 True"""
+    if not isinstance(html, str) or not html:
+        return True
+    return _tag_open_re(tag).search(html) is not None
+
 def _is_chapter_href(href: str) -> bool:
     if not href:
         return False
-    href = href.strip()
-    if href.lower().startswith("javascript:") or href.startswith("#"):
+    h = href.strip()
+    # 仅对前缀/后缀切片做小写比较，避免对整条长 URL 调用 lower()
+    if not h or h[0] == "#" or h[:11].lower() == "javascript:":
         return False
-    return href.lower().endswith(".html")
+    return h[-5:].lower() == ".html"
+
+@lru_cache(maxsize=64)
+def _base_url_parts(base_url: str):
+    """
+    预解析 base_url，供 _abs_url 快速拼接相对链接：
+    返回 (规范化的 "scheme://netloc" 前缀, 目录路径)；不适合快速拼接时返回 None
+    """
+    try:
+        p = urlsplit(base_url)
+        scheme = (p.scheme or "").lower()
+        host = (p.hostname or "").lower()
+        if scheme not in ("http", "https") or not host:
+            return None
+        path = p.path or "/"
+        # 含点段/空段/参数的路径交给 urljoin 处理
+        if not path.startswith("/") or "/." in path or "//" in path or ";" in path:
+            return None
+        netloc = host
+        if p.port and not ((scheme == "http" and p.port == 80) or (scheme == "https" and p.port == 443)):
+            netloc = f"{host}:{p.port}"
+        return f"{scheme}://{netloc}", path[: path.rfind("/") + 1]
+    except Exception:
+        return None
 
 def _abs_url(base_url: str, href_raw: str) -> str:
     """将相对链接规范化为绝对URL，并去除 #/? 尾部碎片"""
     if not href_raw:
         return ""
+    # 快速路径：常见的 "123.html" / "/book/1/123.html" 直接拼接，免去每个锚点一次 urljoin + urlparse
+    h = href_raw
+    for sep in ("#", "?"):
+        k = h.find(sep)
+        if k >= 0:
+            h = h[:k]
+    if (h and h[0] > " " and h[-1] > " " and not h.startswith(("//", "."))
+            and ":" not in h and "/." not in h and "//" not in h
+            and not any(c in h for c in ";\\\t\r\n")):
+        parts = _base_url_parts(base_url)
+        if parts:
+            prefix, base_dir = parts
+            path = h if h[0] == "/" else base_dir + h
+            if len(path) > 1 and path.endswith("/"):
+                path = path.rstrip("/")
+            return prefix + path
     return _normalize_canonical_url(urljoin(base_url, href_raw).split('#')[0].split('?')[0])
 
 def _is_nav_path(url: str) -> bool:
@@ -408,9 +530,8 @@ def _parse_chapnum(t: str, u: str):
         norm = _normalize_title(t)
         m = _RE_TITLE_CHAPNUM.search(norm)
         if m:
-            s = m.group(1)
-            s2 = ''.join(chr(ord(ch) - 65248) if '０' <= ch <= '９' else ch for ch in s).strip()
-            if re.fullmatch(r'\d+', s2):
+            s2 = m.group(1).translate(_FULLWIDTH_DIGITS).strip()
+            if _RE_ALL_DIGITS.fullmatch(s2):
                 try:
                     return int(s2.lstrip('0') or '0')
                 except:
@@ -419,19 +540,12 @@ def _parse_chapnum(t: str, u: str):
             if cn is not None:
                 return cn
         # 更宽松：标题中的纯数字
-        m2 = re.search(r'(?<!\d)(\d{1,6})(?!\d)', norm)
+        m2 = _RE_LOOSE_NUM.search(norm)
         if m2:
             try:
                 return int(m2.group(1))
             except:
                 pass
-    # 备选：URL中的数字.html
-    m3 = re.search(r'(\d+)\.html$', u)
-    if m3:
-        try:
-            return int(m3.group(1))
-        except:
-            pass
     # 最终兜底：更广的 URL 编号提取
     n4 = _extract_id_from_url(u or "")
     if n4:
@@ -439,7 +553,36 @@ def _parse_chapnum(t: str, u: str):
     return None
 
 
-def extract_chapter_list_from_index_precise_fixed(index_html: str, base_url: str):
+def _nearby_header(u, limit: int = 3) -> bool:
+    """
+    判断 ul 附近是否有"全部章节"之类的标题：
+      - 仅检查紧邻的 limit 个前序兄弟节点的直接文本（.string，不做整棵子树 get_text）；
+      - 再检查父节点下第一个标题类子元素（h1-h4/div，非递归）的文本。
+    """
+    checked = 0
+    for sib in u.previous_siblings:
+        if isinstance(sib, str):
+            txt = sib.strip()
+            if not txt:
+                continue
+        else:
+            txt = sib.string or ""
+        if txt and _RE_CHAPTER_CONTAINER_HINT.search(txt):
+            return True
+        checked += 1
+        if checked >= limit:
+            break
+    parent = u.parent
+    if parent is not None:
+        head = parent.find(["h1", "h2", "h3", "h4", "div"], recursive=False)
+        if head is not None and head is not u:
+            txt = head.get_text(strip=True)
+            if txt and _RE_CHAPTER_CONTAINER_HINT.search(txt):
+                return True
+    return False
+
+
+def extract_chapter_list_from_index_precise_fixed(index_html: str, base_url: str, soup=None):
     """
     从书籍详情页 HTML 中提取"全部章节"目录列表，返回：
       [{'index': i, 'title': title, 'url': url, 'chapter_num': maybe_int}, ...]
@@ -450,11 +593,13 @@ def extract_chapter_list_from_index_precise_fixed(index_html: str, base_url: str
       - 仅采集 .html 链接（过滤菜单、首页、分类、书架等非章节项）；
       - 保持页面 DOM 顺序（避免盲目按 URL 数字排序造成乱序或丢章）；
       - 尝试解析章节号（title 或 url 的尾部数字），放到 chapter_num 中，便于后续校验/排序。
+    soup: 可选，index_html 已解析的文档树（调用方已解析过时传入，避免二次解析）
     """
-    soup = _bs(index_html)
+    if soup is None:
+        soup = _bs(index_html)
 
-    # 检测是否为笔趣看风格的 <dl> 结构
-    dl_elements = soup.find_all("dl")
+    # 检测是否为笔趣看风格的 <dl> 结构（源码中无 <dl 时跳过整树查找）
+    dl_elements = soup.find_all("dl") if _may_contain_tag(index_html, "dl") else []
     if dl_elements:
         # 尝试处理笔趣看风格的章节列表
         entries = _extract_from_dl_structure(dl_elements, base_url)
@@ -486,28 +631,23 @@ def extract_chapter_list_from_index_precise_fixed(index_html: str, base_url: str
             # 优先选择有“全部章节”提示的容器
             for u in uls:
                 try:
-                    parent_text = u.parent.get_text(" ", strip=True) if u.parent else ""
-                    if parent_text and _RE_CHAPTER_CONTAINER_HINT.search(parent_text):
-                        candidate = u
-                        break
-                    ok = False
-                    for sib in u.previous_siblings:
-                        text = getattr(sib, "get_text", None)
-                        txt = text(" ", strip=True) if callable(text) else (sib.strip() if isinstance(sib, str) else "")
-                        if txt and _RE_CHAPTER_CONTAINER_HINT.search(txt):
-                            ok = True
-                            break
-                    if ok:
+                    if _nearby_header(u):
                         candidate = u
                         break
                 except Exception:
                     continue
-            # 次选：选择 li 数最多的UL
+            # 次选：选择 li 数最多的UL（单次遍历取最大值；>=100 项时必为目录，提前结束）
             if candidate is None:
                 try:
-                    u_sorted = sorted(uls, key=lambda x: len(x.find_all("li")), reverse=True)
-                    if u_sorted and len(u_sorted[0].find_all("li")) >= 5:
-                        candidate = u_sorted[0]
+                    best_u, best_n = None, -1
+                    for u in uls:
+                        n = len(u.find_all("li", recursive=False))
+                        if n > best_n:
+                            best_u, best_n = u, n
+                        if n >= 100:
+                            break
+                    if best_n >= 5:
+                        candidate = best_u
                 except Exception:
                     pass
         all_chapters_ul = candidate
@@ -608,6 +748,8 @@ def extract_chapter_list_from_index_precise_fixed(index_html: str, base_url: str
 
         # 规则优先：沿 next_selectors 线性向后抓取，最多 6 页
         pages = [(1, base_url)]
+        # 已抓取并解析过的分页（url -> soup），合并阶段直接复用，避免重复请求
+        fetched_pages = {base_url: soup}
         if site_rules:
             MAXP = 6
             seenp = {base_url}
@@ -630,6 +772,7 @@ def extract_chapter_list_from_index_precise_fixed(index_html: str, base_url: str
                     cur_html = fetch_html(next_url)
                     cur_soup = _bs(cur_html)
                     cur_url = next_url
+                    fetched_pages[next_url] = cur_soup
                 except Exception:
                     break
 
@@ -657,9 +800,11 @@ def extract_chapter_list_from_index_precise_fixed(index_html: str, base_url: str
             merged = []
             for idx, purl in pages:
                 try:
-                    p_html = index_html if idx == 1 else fetch_html(purl)
-                    time.sleep(0.25 if idx > 1 else 0.0)
-                    page_entries = _extract_entries_from_paged_html(p_html, purl)
+                    p_soup = fetched_pages.get(purl)
+                    if p_soup is None:
+                        p_soup = _bs(fetch_html(purl))
+                        time.sleep(0.25)
+                    page_entries = _extract_entries_from_paged_html("", purl, soup=p_soup)
                     if page_entries:
                         merged.extend(page_entries)
                 except Exception:
@@ -706,9 +851,8 @@ def extract_chapter_list_from_index_precise_fixed(index_html: str, base_url: str
                 purl = queue[i]
                 i += 1
                 try:
-                    p_html = fetch_html(purl)
-                    p_soup = _bs(p_html)
-                    page_entries = _extract_entries_from_paged_html(p_html, purl)
+                    p_soup = _bs(fetch_html(purl))
+                    page_entries = _extract_entries_from_paged_html("", purl, soup=p_soup)
                     if page_entries:
                         entries.extend(page_entries)
                     more = collect_pagination_urls(p_soup, purl)
@@ -806,13 +950,15 @@ def _extract_from_dl_structure(dl_elements, base_url):
     return [] 
 
 
-def _extract_entries_from_paged_html(index_html: str, base_url: str):
+def _extract_entries_from_paged_html(index_html: str, base_url: str, soup=None):
     """
     从分页目录页中提取章节条目（仅限章节容器范围），避免误采导航。
     优先 div#list 下的 dl/dd/a；次选 ul.chapter 下的 a。
+    soup: 可选，已解析的文档树（传入时忽略 index_html）
     """
     try:
-        soup = _bs(index_html)
+        if soup is None:
+            soup = _bs(index_html)
         entries = []
         # 站点规则：按 chapter_selectors 优先解析
         try:
@@ -916,36 +1062,157 @@ def _supplement_entries_from_ul(entries, ul_el, base_url):
     return entries
 
 def _finalize_entries(entries):
-    """最终处理章节列表：去重、添加索引和章节号"""
-    # de-duplicate preserving order
+    """最终处理章节列表：去重、添加索引和章节号（单次遍历完成）"""
     seen_urls = set()
-    cleaned = []
-    for e in entries:
-        u = e["url"]
-        if u in seen_urls:
-            continue
-        seen_urls.add(u)
-        cleaned.append(e)
-
     final = []
-    for i, e in enumerate(cleaned, start=1):
-        # 优先用URL尾数作为章节号（快速），标题作为兜底
+    i = 0
+    for e in entries:
         url = e["url"]
-        chapnum = None
-        m_url = _RE_NUM_HTML_TAIL.search(url)
-        if m_url:
-            try:
-                chapnum = int(m_url.group(1))
-            except:
-                chapnum = None
-        if chapnum is None:
-            chapnum = _parse_chapnum(e.get("title"), url)
+        if url in seen_urls:
+            continue
+        seen_urls.add(url)
+        i += 1
+        # _parse_chapnum 优先用URL尾数作为章节号（快速），标题作为兜底
+        chapnum = _parse_chapnum(e.get("title"), url)
         title = _normalize_title(e.get("title") or (f"第{i}章" if chapnum is None else f"第{chapnum}章"))
+        # 驻留标题字符串：重复标题（如"上架感言"、兜底的"第N章"）共用同一对象，减少长目录的常驻内存
+        title = sys.intern(title)
         final.append({"index": i, "title": title, "url": url, "chapter_num": chapnum})
 
     return final
 
 
+_CHAPTER_IDS = ("content", "chaptercontent", "contentbox", "read-content", "bookcontent", "txt", "nr1")
+_CHAPTER_CLASSES = ("content", "chapter-content", "read-content", "novel-content", "contentbox", "article", "maintext", "nr")
+# BeautifulSoup 把这些标签内的文本记为专门的字符串类型（Script/Stylesheet/TemplateString/Ruby*）：
+# 文本归属最内层的此类祖先标签，get_text 只收集与调用元素同类的文本
+_LX_STRING_CONTAINERS = frozenset(("script", "style", "template", "rt", "rp"))
+_LX_JUNK_TAGS = frozenset(("script", "style", "iframe", "noscript"))
+_LX_JUNK_CLASSES = frozenset(("ads", "advert", "paybox"))
+
+
+def _nonblank_lines(text):
+    """按行拆分并去除首尾空白，丢弃空行（每行只 strip 一次）"""
+    return [t for t in (ln.strip() for ln in text.splitlines()) if t]
+
+
+def _lx_parser():
+    """当前线程的 lxml HTML 解析器（解析器对象不可跨线程共享）"""
+    parser = getattr(_thread_local, "html_parser", None)
+    if parser is None:
+        parser = _lxml_etree.HTMLParser(encoding="utf-8", recover=True)
+        _thread_local.html_parser = parser
+    return parser
+
+
+def _lx_strings(el, removed=()):
+    """按文档顺序收集 el 下的文本片段，规则同 BeautifulSoup.get_text（不含注释），跳过已移除的节点"""
+    target = el.tag if el.tag in _LX_STRING_CONTAINERS else None
+    kind = target
+    if kind is None:
+        kind = next((a.tag for a in el.iterancestors() if a.tag in _LX_STRING_CONTAINERS), None)
+    out = []
+    stack = [(el, kind)]
+    while stack:
+        node, kind = stack.pop()
+        if isinstance(node, str):
+            if kind == target:
+                out.append(node)
+            continue
+        if node in removed or not isinstance(node.tag, str):
+            continue
+        if node.tag in _LX_STRING_CONTAINERS:
+            kind = node.tag
+        if node.text and kind == target:
+            out.append(node.text)
+        # 逆序入栈：弹出顺序为 子节点1、尾随文本1、子节点2 ...；尾随文本归属当前节点
+        for child in reversed(node):
+            if child.tail:
+                stack.append((child.tail, kind))
+            stack.append((child, kind))
+    return out
+
+
+def _lx_text(el, sep="", strip=False, removed=()):
+    parts = _lx_strings(el, removed)
+    if strip:
+        parts = [t for t in (p.strip() for p in parts) if t]
+    return sep.join(parts)
+
+
+def _lx_is_removed(el, removed, stop=None):
+    """el 自身或其祖先（到 stop 为止）是否已被移除"""
+    while el is not None and el is not stop:
+        if el in removed:
+            return True
+        el = el.getparent()
+    return False
+
+
+def _extract_chapter_lxml(html):
+    """
+    extract_title_and_content_from_chapter 的 lxml 实现，结果与 BeautifulSoup 路径一致；
+    广告等节点不真正删除（删除会把尾随文本并入前一节点），而是记入 removed 集合在取文本时跳过。
+    无法解析时返回 None
+    """
+    data = html if isinstance(html, bytes) else (html or "").encode("utf-8", "replace")
+    root = _lxml_etree.fromstring(data, _lx_parser())
+    if root is None:
+        return None
+    title = ""
+    h1_el = next(root.iter("h1"), None)
+    if h1_el is not None:
+        title = _lx_text(h1_el, strip=True)
+    if not title:
+        title_el = next(root.iter("title"), None)
+        if title_el is not None and len(title_el) == 0 and title_el.text:
+            title = _RE_TITLE_TAIL.sub("", title_el.text.strip()).strip()
+    # 一次遍历收集各 id 的首个元素与各 class 的全部元素
+    by_id = {}
+    by_class = {cls: [] for cls in _CHAPTER_CLASSES}
+    for el in root.iter(_lxml_etree.Element):
+        idv = el.get("id")
+        if idv in _CHAPTER_IDS and idv not in by_id:
+            by_id[idv] = el
+        cls_attr = el.get("class")
+        if cls_attr:
+            for cls in set(cls_attr.split()):
+                if cls in by_class:
+                    by_class[cls].append(el)
+    candidates = [by_id[idn] for idn in _CHAPTER_IDS if idn in by_id]
+    for cls in _CHAPTER_CLASSES:
+        candidates.extend(by_class[cls])
+    if not candidates:
+        divs = [d for d in root.iter("div", "article", "section") if len(_lx_text(d, strip=True)) > 120]
+        divs.sort(key=lambda d: len(_lx_text(d)), reverse=True)
+        if divs:
+            candidates.append(divs[0])
+    removed = set()
+    for cont in candidates:
+        if _lx_is_removed(cont, removed):
+            continue
+        for el in cont.iterdescendants(_lxml_etree.Element):
+            cls_attr = el.get("class")
+            if el.tag in _LX_JUNK_TAGS or (cls_attr and not _LX_JUNK_CLASSES.isdisjoint(cls_attr.split())):
+                removed.add(el)
+        paragraphs = []
+        ps = [p for p in cont.iterdescendants("p") if not _lx_is_removed(p, removed, cont)]
+        if ps:
+            for p in ps:
+                t = _lx_text(p, "\n", True, removed)
+                if t:
+                    paragraphs.append(t)
+        else:
+            raw = _lx_text(cont, "\n", True, removed)
+            paragraphs = _nonblank_lines(raw)
+        if paragraphs:
+            return title or "", "\n\n".join(paragraphs), paragraphs
+    body = next(root.iter("body"), None)
+    raw = _lx_text(body if body is not None else root, "\n", True, removed)
+    lines = _nonblank_lines(raw)
+    return title or "", "\n\n".join(lines), lines
+
+
 def extract_title_and_content_from_chapter(html, base_url=None):
     """
     从章节页面HTML中提取标题和正文内容
@@ -957,6 +1224,14 @@ def extract_title_and_content_from_chapter(html, base_url=None):
     返回:
         tuple: (标题, 内容, 段落列表)
     """
+    if _LXML_AVAILABLE:
+        try:
+            result = _extract_chapter_lxml(html)
+            if result is not None:
+                return result
+        except Exception:
+            # 快速路径出错时回退到 BeautifulSoup，并记录异常以便发现快速路径的问题
+            logging.warning("lxml 解析章节失败，回退到 BeautifulSoup", exc_info=True)
     soup = _bs(html)
     title = ""
     h1_el = soup.find("h1")
@@ -964,14 +1239,12 @@ def extract_title_and_content_from_chapter(html, base_url=None):
         title = h1_el.get_text(strip=True)
     if not title and soup.title and soup.title.string:
         title = soup.title.string.strip()
-        title = re.sub(r"\s*[-_—|].*$", "", title).strip()
-    ids = ("content", "chaptercontent", "contentbox", "read-content", "bookcontent", "txt", "nr1")
-    classes = ("content", "chapter-content", "read-content", "novel-content", "contentbox", "article", "maintext", "nr")
+        title = _RE_TITLE_TAIL.sub("", title).strip()
     candidates = []
-    for idn in ids:
+    for idn in _CHAPTER_IDS:
         el = soup.find(id=idn)
         if el: candidates.append(el)
-    for cls in classes:
+    for cls in _CHAPTER_CLASSES:
         for el in soup.find_all(class_=cls):
             candidates.append(el)
     if not candidates:
@@ -993,17 +1266,35 @@ def extract_title_and_content_from_chapter(html, base_url=None):
                     paragraphs.append(t)
         else:
             raw = cont.get_text("\n", strip=True)
-            lines = [ln.strip() for ln in raw.splitlines() if ln.strip()]
+            lines = _nonblank_lines(raw)
             paragraphs = lines
         if paragraphs:
             content = "\n\n".join(paragraphs)
             return title or "", content, paragraphs
     raw = soup.body.get_text("\n", strip=True) if soup.body else soup.get_text("\n", strip=True)
-    lines = [ln.strip() for ln in raw.splitlines() if ln.strip()]
+    lines = _nonblank_lines(raw)
     content = "\n\n".join(lines)
     return title or "", content, lines
 
 
+def _json_loads(data: bytes):
+    """解析 UTF-8 JSON 字节，优先使用 orjson"""
+    if _ORJSON_AVAILABLE:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+def _json_dumps(obj) -> bytes:
+    """序列化为带缩进的 UTF-8 JSON 字节（不转义中文），优先使用 orjson"""
+    if _ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # 超出 orjson 支持范围的对象（如超大整数）回退到标准库
+            pass
+    return json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+
+
 def load_json(path: Path, default):
     """
     从指定路径加载JSON文件，如果失败则返回默认值
@@ -1017,7 +1308,7 @@ def load_json(path: Path, default):
     """
     try:
         if path.exists():
-            return json.loads(path.read_text(encoding="utf-8"))
+            return _json_loads(path.read_bytes())
     except Exception:
         pass
     return default
@@ -1025,14 +1316,105 @@ def load_json(path: Path, default):
 
 def save_json(path: Path, obj):
     """
-    将对象保存为JSON文件
+    将对象保存为JSON文件（先写临时文件再替换，避免写入中断导致文件损坏）
 
     参数:
         path: 保存路径
         obj: 要保存的对象
     """
+    _write_bytes_atomic(path, _json_dumps(obj))
+
+
+def save_json_if_changed(path: Path, obj, last_digest=None):
+    """
+    序列化对象并与上次写入内容的摘要比较，内容未变化时跳过写盘
+
+    参数:
+        path: 保存路径
+        obj: 要保存的对象
+        last_digest: 上次写入时返回的摘要（首次为 None）
+
+    返回:
+        bytes: 本次内容的摘要，供下次调用比较
+    """
+    data = _json_dumps(obj)
+    digest = hashlib.blake2b(data, digest_size=8).digest()
+    if digest != last_digest:
+        _write_bytes_atomic(path, data)
+    return digest
+
+
+def _write_bytes_atomic(path: Path, data: bytes):
+    """先写临时文件再替换，避免写入中断导致文件损坏"""
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(obj, ensure_ascii=False, indent=2), encoding="utf-8")
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, path)
+
+
+# 后台单写线程：序列化在调用线程完成（得到内容快照），写盘交给写线程。
+# 队列中只放路径，同一文件待写入的内容只保留最新一份，连续保存自动合并为一次写盘
+_bg_save_queue = queue.Queue()
+_bg_save_pending = {}
+_bg_save_failed = set()
+_bg_save_lock = threading.Lock()
+_bg_save_thread = None
+
+
+def _bg_save_loop():
+    while True:
+        path = _bg_save_queue.get()
+        try:
+            with _bg_save_lock:
+                item = _bg_save_pending.pop(path, None)
+            if item is not None:
+                data, on_error = item
+                try:
+                    _write_bytes_atomic(path, data)
+                    _bg_save_failed.discard(path)
+                except Exception as e:
+                    # 失败后下次保存不再按摘要跳过，确保内容最终落盘
+                    _bg_save_failed.add(path)
+                    logging.exception(f"后台保存失败: {path}")
+                    if on_error is not None:
+                        try:
+                            on_error(str(path), str(e))
+                        except Exception:
+                            logging.exception("后台保存失败回调出错")
+        finally:
+            _bg_save_queue.task_done()
+
+
+def save_json_in_background(path: Path, obj, last_digest=None, on_error=None):
+    """
+    与 save_json_if_changed 相同，但写盘在后台线程进行，调用线程不等待文件 I/O
+
+    参数:
+        on_error: 写盘失败时在后台线程调用 on_error(路径, 错误信息)（可选；
+                  界面侧应传入跨线程信号的 emit，如 BackgroundSaveSignals.failed.emit）
+
+    返回:
+        bytes: 本次内容的摘要，供下次调用比较
+    """
+    global _bg_save_thread
+    data = _json_dumps(obj)
+    digest = hashlib.blake2b(data, digest_size=8).digest()
+    if digest == last_digest and path not in _bg_save_failed:
+        return digest
+    with _bg_save_lock:
+        queued = path in _bg_save_pending
+        _bg_save_pending[path] = (data, on_error)
+        if _bg_save_thread is None:
+            _bg_save_thread = threading.Thread(target=_bg_save_loop, name="json-writer", daemon=True)
+            _bg_save_thread.start()
+    if not queued:
+        _bg_save_queue.put(path)
+    return digest
+
+
+def flush_background_saves():
+    """阻塞直到后台排队的写入全部完成（退出程序前调用）"""
+    _bg_save_queue.join()
 
 
 def create_book_directory_and_debug(meta, chapters):
@@ -1040,7 +1422,7 @@ def create_book_directory_and_debug(meta, chapters):
     创建书籍目录并保存调试文件
     
     参数:
-        meta: 书籍元数据
+        meta: 书籍元数据（目录内容摘要记录在 meta["chapters_hash"]，目录未变化时跳过写文件）
         chapters: 章节列表
     """
     bdir = Path(meta["book_dir"])
@@ -1048,7 +1430,12 @@ def create_book_directory_and_debug(meta, chapters):
     
     try:
         debug_path = bdir / "index_debug.json"
-        debug_path.write_text(json.dumps(chapters, ensure_ascii=False, indent=2), encoding="utf-8")
+        data = _json_dumps(chapters)
+        digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+        if meta.get("chapters_hash") == digest and debug_path.exists():
+            return
+        debug_path.write_bytes(data)
+        meta["chapters_hash"] = digest
     except Exception:
         pass
 
@@ -1061,9 +1448,9 @@ def generate_book_id_from_url(url):
         url: 书籍URL
         
     返回:
-        str: 生成的书籍ID
+        str: 生成的书籍ID（BLAKE2b 摘要，跨进程稳定；内置 hash() 对字符串加盐，每次启动结果不同）
     """
-    return str(abs(hash(url)))
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=8).hexdigest()
 
 
 def create_book_metadata(url, chapters, soup_title=None):
@@ -1105,18 +1492,20 @@ def create_book_metadata(url, chapters, soup_title=None):
     return bid, meta
 
 
-def extract_book_title_from_html(html):
+def extract_book_title_from_html(html, soup=None):
     """
     从HTML中提取书籍标题
 
     参数:
         html: 书籍页面的HTML内容
+        soup: 可选，html 已解析的文档树（传入时复用，避免重复解析）
 
     返回:
         str: 提取的书籍标题，如果无法提取则返回空字符串
     """
     try:
-        soup = _bs(html)
+        if soup is None:
+            soup = _bs(html)
         if soup.title and soup.title.string:
             title = soup.title.string.strip().split("-")[0].strip()
             return title
@@ -1125,6 +1514,22 @@ def extract_book_title_from_html(html):
     return ""
 
 
+def chapter_body_html(content):
+    """将章节正文转换为 HTML 片段（转义特殊字符、换行转 <br>），与样式无关"""
+    # 转义 & < >（C 实现，一次遍历），避免正文中的符号被当作标签/实体解析
+    return _html_escape(content or "", quote=False).replace("\n", "<br>")
+
+
+def chapter_style_css(line_height, night_mode=False, default_text_color="#800000"):
+    """
+    生成章节正文的样式表（作用于 class="chapter" 的容器），
+    供 QTextDocument.setDefaultStyleSheet 使用，样式不变时无需随每章 HTML 重复解析。
+    字体与字号不写入样式表，由 QTextBrowser 的控件字体（文档默认字体）提供，调整字号时无需重新 setHtml
+    """
+    text_color = "#d0d0d0" if night_mode else default_text_color
+    return f".chapter {{ white-space:pre-wrap; line-height:{line_height}; color:{text_color}; padding:20px; }}"
+
+
 def process_chapter_content_for_display(content, font_family, font_size, line_height, night_mode=False, default_text_color="#800000"):
     """
     处理章节内容以便在UI中显示
@@ -1144,122 +1549,134 @@ def process_chapter_content_for_display(content, font_family, font_size, line_he
     text_color = "#d0d0d0" if night_mode else default_text_color
 
     # 处理内容中的特殊字符和换行符
-    # 正确的HTML转义，避免内容中的符号影响显示
-    processed_content = (content or "").replace("&", "&").replace("<", "<").replace(">", ">").replace("\n", "<br>")
+    processed_content = chapter_body_html(content)
 
     html = f"""<div style='white-space:pre-wrap;font-family:{font_family};font-size:{font_size}pt;line-height:{line_height};color:{text_color};padding:20px;'>{processed_content}</div>"""
 
     return html
 
 
-# Index fetch thread - 处理目录获取和解析
-class IndexFetchThread(QThread):
+class IndexFetchSignals(QObject):
+    """目录获取任务的信号桥（QRunnable 不是 QObject，无法直接定义信号）"""
+    finished = Signal(list, str, str)  # chapters, title, error
+    progress = Signal(str)
+    chapter_batch_ready = Signal(list, int, int)  # batch_chapters, current_count, total_estimated
+
+
+# Index fetch task - 处理目录获取和解析
+class IndexFetchRunnable(QRunnable):
     """
-    目录获取线程：异步请求目录页与解析，避免阻塞UI
+    目录获取任务：在线程池中异步请求目录页与解析，避免阻塞UI
     
-    包含内存优化的章节提取功能，支持大量章节的分批处理
+    包含内存优化的章节提取功能，支持大量章节的分批处理；
+    信号通过 self.signals 发出
     """
-    finished = Signal(list, str)  # chapters, error
-    progress = Signal(str)
-    chapter_batch_ready = Signal(list, int, int)  # batch_chapters, current_count, total_estimated
 
     def __init__(self, url):
         super().__init__()
         self.url = url
-        self._should_stop = False
+        self.signals = IndexFetchSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """请求停止任务：不再回传结果"""
+        self._cancel.set()
 
-    def stop(self):
-        """停止线程执行"""
-        self._should_stop = True
+    def is_cancelled(self):
+        return self._cancel.is_set()
 
     def run(self):
-        """线程主执行函数"""
+        """任务主执行函数"""
         try:
-            self.progress.emit("请求目录页…")
+            self.signals.progress.emit("请求目录页…")
             html = fetch_html(self.url)
+            # 详情页只解析一次，定位目录与后续提取共用同一棵文档树
+            soup = _bs(html)
+            # 书名取自用户给出的详情页，在工作线程中顺带提取，导入时无需再次请求
+            title = extract_book_title_from_html(html, soup)
             # 适配：部分站点（如 m.syvvw.cc）详情页不含完整目录，尝试跳转到 /book/{id}.html
-            alt_url = _locate_full_chapter_index(self.url, html)
+            alt_url = _locate_full_chapter_index(self.url, html, soup)
             if alt_url and alt_url != self.url:
                 try:
-                    self.progress.emit("发现完整目录页，跳转解析…")
+                    self.signals.progress.emit("发现完整目录页，跳转解析…")
                     html = fetch_html(alt_url)
+                    soup = _bs(html)
                     self.url = alt_url
                 except Exception:
                     # 跳转失败不影响后续解析
                     pass
-            self.progress.emit("解析目录…")
+            self.signals.progress.emit("解析目录…")
             
             # 使用流式处理来避免内存峰值
-            chapters = self._extract_chapters_with_memory_optimization(html, self.url)
+            chapters = self._extract_chapters_with_memory_optimization(html, self.url, soup)
             
-            if not self._should_stop:
-                self.finished.emit(chapters, "")
+            if not self.is_cancelled():
+                self.signals.finished.emit(chapters, title, "")
         except Exception as e:
-            if not self._should_stop:
-                self.finished.emit([], str(e))
+            if not self.is_cancelled():
+                self.signals.finished.emit([], "", str(e))
 
-    def _extract_chapters_with_memory_optimization(self, html, base_url):
-        """内存优化的章节提取方法"""
+    def _extract_chapters_with_memory_optimization(self, html, base_url, soup=None):
+        """内存优化的章节提取方法（soup 为 html 已解析的文档树，可选）"""
         try:
             # 针对存在目录分页的站点（tbxsvv/tbxsw/syvvw），强制走标准解析以覆盖所有分页
             host = (urlparse(base_url).netloc or "").lower()
             if ("tbxsvv.cc" in host) or ("tbxsw.cc" in host) or ("syvvw.cc" in host):
-                return extract_chapter_list_from_index_precise_fixed(html, base_url)
+                return extract_chapter_list_from_index_precise_fixed(html, base_url, soup)
 
             # 首先快速估算章节数量
-            self.progress.emit("估算章节数量…")
+            self.signals.progress.emit("估算章节数量…")
             estimated_count = self._estimate_chapter_count(html)
             
             if estimated_count > 3000:
                 # 对于大量章节，使用分批处理（仅在无分页站点使用）
-                self.progress.emit(f"检测到大量章节({estimated_count}+)，使用内存优化模式…")
-                return self._extract_chapters_in_batches(html, base_url, estimated_count)
+                self.signals.progress.emit(f"检测到大量章节({estimated_count}+)，使用内存优化模式…")
+                return self._extract_chapters_in_batches(html, base_url, estimated_count, soup)
             else:
                 # 对于较少章节，使用原始方法
-                return extract_chapter_list_from_index_precise_fixed(html, base_url)
+                return extract_chapter_list_from_index_precise_fixed(html, base_url, soup)
                 
         except Exception as e:
             # 如果优化方法失败，回退到原始方法
-            self.progress.emit("优化模式失败，回退到标准模式…")
-            return extract_chapter_list_from_index_precise_fixed(html, base_url)
+            self.signals.progress.emit("优化模式失败，回退到标准模式…")
+            return extract_chapter_list_from_index_precise_fixed(html, base_url, soup)
 
     def _estimate_chapter_count(self, html):
         """快速估算章节数量"""
         # 简单计算 .html 链接的数量作为估算
-        html_links = re.findall(r'href="[^"]*\.html"', html, re.IGNORECASE)
+        html_links = _RE_HTML_HREF.findall(html)
         return len(html_links)
 
-    def _extract_chapters_in_batches(self, html, base_url, estimated_count):
+    def _extract_chapters_in_batches(self, html, base_url, estimated_count, soup=None):
         """分批提取章节，减少内存占用"""
-        import gc
-        
         all_chapters = []
         batch_size = 500  # 每批处理500章
         
         try:
-            self.progress.emit("开始分批解析章节…")
+            self.signals.progress.emit("开始分批解析章节…")
             
-            # 使用更轻量的解析方式
-            soup = _bs(html)
+            # 复用已解析的文档树
+            if soup is None:
+                soup = _bs(html)
             
             # 找到章节容器
             chapter_container = self._find_chapter_container(soup)
             if not chapter_container:
                 # 如果找不到容器，回退到原始方法
-                return extract_chapter_list_from_index_precise_fixed(html, base_url)
+                return extract_chapter_list_from_index_precise_fixed(html, base_url, soup)
             
             # 获取所有章节链接
             chapter_links = chapter_container.find_all("a", href=True)
             total_links = len(chapter_links)
             
-            self.progress.emit(f"找到 {total_links} 个链接，开始分批处理…")
+            self.signals.progress.emit(f"找到 {total_links} 个链接，开始分批处理…")
             
             processed_count = 0
             batch_chapters = []
             seen_urls = set()
             
             for i, link in enumerate(chapter_links):
-                if self._should_stop:
+                if self.is_cancelled():
                     break
                     
                 try:
@@ -1295,7 +1712,7 @@ class IndexFetchThread(QThread):
                     # 达到批次大小或处理完成时，处理当前批次
                     if len(batch_chapters) >= batch_size or i == len(chapter_links) - 1:
                         # 发送批次数据
-                        self.chapter_batch_ready.emit(batch_chapters.copy(), processed_count, total_links)
+                        self.signals.chapter_batch_ready.emit(batch_chapters.copy(), processed_count, total_links)
                         
                         # 添加到总列表
                         all_chapters.extend(batch_chapters)
@@ -1305,7 +1722,7 @@ class IndexFetchThread(QThread):
                         
                         # 更新进度
                         progress_pct = int((processed_count / total_links) * 100)
-                        self.progress.emit(f"已处理 {processed_count}/{total_links} 章节 ({progress_pct}%)")
+                        self.signals.progress.emit(f"已处理 {processed_count}/{total_links} 章节 ({progress_pct}%)")
                         
                         # 强制垃圾回收
                         if processed_count % 1000 == 0:
@@ -1315,13 +1732,13 @@ class IndexFetchThread(QThread):
                     # 单个章节处理失败不影响整体
                     continue
             
-            self.progress.emit(f"章节解析完成，共 {len(all_chapters)} 章")
+            self.signals.progress.emit(f"章节解析完成，共 {len(all_chapters)} 章")
             return all_chapters
             
         except Exception as e:
-            self.progress.emit(f"分批处理失败: {str(e)}")
+            self.signals.progress.emit(f"分批处理失败: {str(e)}")
             # 回退到原始方法
-            return extract_chapter_list_from_index_precise_fixed(html, base_url)
+            return extract_chapter_list_from_index_precise_fixed(html, base_url, soup)
 
     def _find_chapter_container(self, soup):
         """查找章节容器"""
@@ -1357,55 +1774,148 @@ class IndexFetchThread(QThread):
         return _normalize_title(_clean_text(title))
 
 
-# Chapter fetch thread
-class ChapterFetchThread(QThread):
+class ChapterFetchSignals(QObject):
+    """章节获取任务的信号桥"""
+    finished = Signal(int, dict, str)
+    progress = Signal(str)
+
+
+# Chapter fetch task
+class ChapterFetchRunnable(QRunnable):
     """
-    章节内容获取线程
+    章节内容获取任务
 
-    用于异步获取章节内容，避免阻塞UI线程
+    在线程池中异步获取章节内容，避免阻塞UI线程；信号通过 self.signals 发出。
+    取消后不再回传结果，也不再写入缓存（书籍被删除时，迟到的写入不会重建缓存目录）
     """
-    finished = Signal(int, dict, str)
-    progress = Signal(str)
 
-    def __init__(self, chapter_url, index, cache_dir):
+    def __init__(self, chapter_url, index, cache_dir, prefetch=False):
         """
-        初始化章节获取线程
+        初始化章节获取任务
 
         参数:
             chapter_url: 章节URL
             index: 章节索引
             cache_dir: 缓存目录
+            prefetch: 是否为后台预取（只写缓存，不发进度信息）
         """
         super().__init__()
         self.chapter_url = chapter_url
         self.index = index
         self.cache_dir = Path(cache_dir)
+        self.prefetch = prefetch
+        self.signals = ChapterFetchSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """请求取消任务"""
+        self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def _emit_finished(self, data, error):
+        if not self.is_cancelled():
+            self.signals.finished.emit(self.index, data, error)
 
     def run(self):
         """
-        线程运行函数
+        任务运行函数
         获取章节内容，如果缓存存在则从缓存读取，否则从网络获取并缓存
         """
         try:
             json_path = self.cache_dir / f"{self.index:04d}.json"
             if json_path.exists():
                 try:
-                    data = json.loads(json_path.read_text(encoding="utf-8"))
-                    self.finished.emit(self.index, data, "")
+                    data = _json_loads(json_path.read_bytes())
+                    self._emit_finished(data, "")
                     return
                 except Exception:
                     pass
-            self.progress.emit(f"请求章节: {self.chapter_url}")
+            if self.is_cancelled():
+                return
+            if not self.prefetch:
+                self.signals.progress.emit(f"请求章节: {self.chapter_url}")
             html = fetch_html(self.chapter_url)
             title, content, paragraphs = extract_title_and_content_from_chapter(html, base_url=self.chapter_url)
             data = {"index": self.index, "title": title, "url": self.chapter_url, "content": content, "paragraphs": paragraphs}
+            # 请求期间被取消（如书籍已删除）时不写缓存
+            if self.is_cancelled():
+                return
             self.cache_dir.mkdir(parents=True, exist_ok=True)
-            json_path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
-            self.finished.emit(self.index, data, "")
+            # 先写临时文件再替换：预取与正常抓取可能同时写同一章节，避免读到半截文件
+            tmp_path = json_path.with_name(f"{json_path.name}.{threading.get_ident()}.tmp")
+            tmp_path.write_bytes(_json_dumps(data))
+            if self.is_cancelled():
+                tmp_path.unlink(missing_ok=True)
+                return
+            os.replace(tmp_path, json_path)
+            self._emit_finished(data, "")
         except Exception as e:
-            self.finished.emit(self.index, {}, str(e))
+            self._emit_finished({}, str(e))
+
+
+
+class BackgroundSaveSignals(QObject):
+    """后台保存的信号桥：failed(路径, 错误信息)，在后台写线程发出，排队送达界面线程"""
+    failed = Signal(str, str)
 
 
+class RemoveDirSignals(QObject):
+    """目录删除任务的信号桥：finished(是否成功, 错误信息)"""
+    finished = Signal(bool, str)
+
+
+def _remove_tree(path):
+    """
+    删除目录树：scandir 返回的 DirEntry 已带文件类型，普通文件直接 unlink，
+    仅子目录（如 chapters/）递归处理，省去 rmtree 对每个条目的额外 stat。
+    条目在删除过程中被其他线程移走（如章节任务替换临时文件）时忽略
+    """
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        _remove_tree(entry.path)
+                    else:
+                        os.unlink(entry.path)
+                except FileNotFoundError:
+                    pass
+        os.rmdir(path)
+    except FileNotFoundError:
+        pass
+
+
+class RemoveDirRunnable(QRunnable):
+    """
+    在线程池中删除目录树（书籍缓存可能有数千个章节文件，避免在 UI 线程上 rmtree）
+    已取消的章节任务可能在删除过程中写入最后一个文件，目录非空时稍候重试
+    """
+
+    RETRIES = 3
+    RETRY_DELAY = 0.2
+
+    def __init__(self, path):
+        super().__init__()
+        self.path = Path(path)
+        self.signals = RemoveDirSignals()
+
+    def run(self):
+        try:
+            for attempt in range(self.RETRIES):
+                try:
+                    if self.path.is_dir():
+                        _remove_tree(self.path)
+                    break
+                except OSError as e:
+                    if e.errno != errno.ENOTEMPTY or attempt == self.RETRIES - 1:
+                        raise
+                    time.sleep(self.RETRY_DELAY)
+            self.signals.finished.emit(True, "")
+        except Exception as e:
+            self.signals.finished.emit(False, f"{self.path}: {e}")
+
 # module exports
 __all__ = [
     "fetch_html",
@@ -1413,11 +1923,18 @@ __all__ = [
     "extract_title_and_content_from_chapter",
     "extract_book_title_from_html",
     "process_chapter_content_for_display",
+    "chapter_body_html",
+    "chapter_style_css",
     "load_json",
     "save_json",
+    "save_json_if_changed",
+    "save_json_in_background",
+    "flush_background_saves",
     "create_book_directory_and_debug",
     "generate_book_id_from_url",
     "create_book_metadata",
-    "IndexFetchThread",
-    "ChapterFetchThread"
+    "IndexFetchRunnable",
+    "ChapterFetchRunnable",
+    "BackgroundSaveSignals",
+    "RemoveDirRunnable"
 ]
@@ -37,6 +37,9 @@ CF_CLEARANCE = ""  # 留空则优先使用 cf_cookies.txt 文件
 COOKIE_FILE = os.path.join(os.path.dirname(__file__), "cf_cookies.txt")
 COOKIE_META_FILE = os.path.join(os.path.dirname(__file__), "cf_cookies_meta.json")
 
+# 响应未在 Content-Type 中声明字符集时，仅在头部 4KB 内查找 <meta charset>
+_RE_META_CHARSET = re.compile(br'<meta[^>]+charset=["\']?\s*([A-Za-z0-9_\-]+)', re.IGNORECASE)
+
 
 def load_cf_clearance():
     """
@@ -232,7 +235,11 @@ def search_kele_books(keyword: str, timeout: int = 30) -> List[Dict]:
         
         response.raise_for_status()
         
-        # 解析结果
+        # 解析结果（响应头未声明编码时优先取页面前 4KB 的 <meta charset>，避免 requests 回退到 ISO-8859-1；
+        # 两者都没有时才交给 requests 的编码探测，GBK 等页面不会被按 UTF-8 误解码）
+        if 'charset' not in (response.headers.get('Content-Type') or '').lower():
+            m = _RE_META_CHARSET.search(response.content[:4096])
+            response.encoding = m.group(1).decode('ascii', 'ignore') if m else response.apparent_encoding
         html = response.text
         
         # 调试：检查响应内容
@@ -3,48 +3,94 @@
 使用 CFCookie 方案进行搜索
 """
 import logging
+import os
+import threading
 from typing import List, Dict
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, 
     QPushButton, QListWidget, QListWidgetItem, QLabel, QFrame
 )
-from PySide6.QtCore import Qt, QThread, Signal
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, Signal
 
 # 导入搜索核心功能
 from kele_search import (
     search_kele_books, 
     load_cf_clearance, 
     save_cf_clearance,
-    get_cookie_info
+    get_cookie_info,
+    CF_CLEARANCE,
+    COOKIE_FILE
 )
 
 
-class SearchThread(QThread):
-    """搜索线程"""
+# 提示文字颜色（按级别）
+_TIP_COLORS_NIGHT = {
+    "success": "#66bb6a",  # 绿色
+    "warning": "#ffa726",  # 橙色
+    "error": "#ef5350",    # 红色
+    "info": "#d0d0d0"      # 默认文字色
+}
+_TIP_COLORS_DAY = {
+    "success": "#2e7d32",  # 深绿
+    "warning": "#f57c00",  # 深橙
+    "error": "#c62828",    # 深红
+    "info": "#5D4E37"      # 默认文字色
+}
+
+# cookie 前缀标签样式：颜色与 QListWidget 文字颜色一致
+_PREFIX_STYLE_NIGHT = "color: #d0d0d0; font-family: Consolas, 'Courier New', monospace; font-weight: bold;"
+_PREFIX_STYLE_DAY = "color: #800000; font-family: Consolas, 'Courier New', monospace; font-weight: bold;"
+
+
+def _build_tip_styles(colors: Dict[str, str]) -> Dict[str, str]:
+    """按级别预生成提示标签样式表"""
+    return {level: f"color: {color}; padding: 4px 0;" for level, color in colors.items()}
+
+
+class SearchSignals(QObject):
+    """搜索任务信号桥（QRunnable 本身不是 QObject，无法直接发信号）"""
     finished = Signal(list, str)  # (results, error)
     progress = Signal(str)  # 进度信息
+
+
+class SearchRunnable(QRunnable):
+    """搜索任务：在全局线程池中执行，避免每次搜索新建/销毁线程"""
     
     def __init__(self, keyword: str):
         super().__init__()
         self.keyword = keyword
+        self.signals = SearchSignals()
+        self._cancelled = threading.Event()
+        
+    def cancel(self):
+        """取消任务：网络请求无法中断，但结果不再回传"""
+        self._cancelled.set()
+        
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
         
     def run(self):
         """执行搜索"""
         try:
-            self.progress.emit(f"正在搜索: {self.keyword}")
+            if self.is_cancelled():
+                return
+            self.signals.progress.emit(f"正在搜索: {self.keyword}")
             results = search_kele_books(self.keyword)
+            if self.is_cancelled():
+                return
             
             if not results:
-                self.finished.emit([], "未找到相关书籍")
+                self.signals.finished.emit([], "未找到相关书籍")
                 return
                 
-            self.progress.emit(f"找到 {len(results)} 本书籍")
-            self.finished.emit(results, "")
+            self.signals.progress.emit(f"找到 {len(results)} 本书籍")
+            self.signals.finished.emit(results, "")
             
         except Exception as e:
             logging.exception("搜索失败")
-            self.finished.emit([], str(e))
+            if not self.is_cancelled():
+                self.signals.finished.emit([], str(e))
 
 
 class SearchWindow(QMainWindow):
@@ -56,9 +102,19 @@ class SearchWindow(QMainWindow):
         self.setWindowFlags(Qt.WindowType.Window)
         self.setWindowTitle("可乐读书 - 搜索书籍")
         self.resize(950, 600)
-        self.search_thread = None
+        self._pool = QThreadPool.globalInstance()
+        self._current_runnable = None
         self.search_results = []
         self._night_mode = False
+        self._tip_styles = _build_tip_styles(_TIP_COLORS_DAY)
+        # cookie 缓存：按文件修改时间失效，避免每次搜索都读盘
+        self._cached_cookie = None
+        self._cookie_mtime = None
+        # 回车/按钮连续触发时合并为一次搜索
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(250)
+        self._debounce.timeout.connect(self._do_search_impl)
         self.setup_ui()
         self.load_cookie()
         
@@ -159,24 +215,32 @@ class SearchWindow(QMainWindow):
     def set_night_mode(self, night_mode: bool):
         """设置夜间模式，同步主窗口主题"""
         self._night_mode = night_mode
+        self._tip_styles = _build_tip_styles(_TIP_COLORS_NIGHT if night_mode else _TIP_COLORS_DAY)
         self._update_prefix_style()
         
     def _update_prefix_style(self):
         """更新前缀标签样式，使用与列表文字相同的颜色"""
-        if self._night_mode:
-            # 夜间模式：使用 #d0d0d0 (与 QListWidget 文字颜色一致)
-            self.prefix_label.setStyleSheet(
-                "color: #d0d0d0; font-family: Consolas, 'Courier New', monospace; font-weight: bold;"
-            )
-        else:
-            # 亮色模式：使用 #800000 (与 QListWidget 文字颜色一致)
-            self.prefix_label.setStyleSheet(
-                "color: #800000; font-family: Consolas, 'Courier New', monospace; font-weight: bold;"
-            )
+        self.prefix_label.setStyleSheet(_PREFIX_STYLE_NIGHT if self._night_mode else _PREFIX_STYLE_DAY)
+        
+    def _cookie(self):
+        """获取 cf_clearance（缓存；cookie 文件修改时间变化时重新加载）"""
+        if CF_CLEARANCE and CF_CLEARANCE.strip():
+            # 代码中配置的常量优先，无需读文件
+            return load_cf_clearance()
+        try:
+            mtime = os.path.getmtime(COOKIE_FILE)
+        except OSError:
+            self._cached_cookie = None
+            self._cookie_mtime = None
+            return None
+        if mtime != self._cookie_mtime:
+            self._cached_cookie = load_cf_clearance()
+            self._cookie_mtime = mtime
+        return self._cached_cookie
         
     def load_cookie(self):
         """加载现有 cookie"""
-        cookie = load_cf_clearance()
+        cookie = self._cookie()
         if cookie:
             self.cookie_input.setText(cookie)
             
@@ -208,6 +272,8 @@ class SearchWindow(QMainWindow):
             return
         
         if save_cf_clearance(cookie):
+            # 强制下次重新读取（同一时间戳内的多次写入 mtime 可能不变）
+            self._cookie_mtime = None
             self._set_tip("✓ Cookie 已保存（预计有效期约 12 小时）", "success")
             # 重新加载以显示时间信息
             self.load_cookie()
@@ -215,13 +281,17 @@ class SearchWindow(QMainWindow):
             self._set_tip("❌ Cookie 保存失败", "error")
         
     def do_search(self):
+        """触发搜索（防抖：250ms 内的重复触发只执行一次）"""
+        self._debounce.start()
+        
+    def _do_search_impl(self):
         """执行搜索"""
         keyword = self.search_input.text().strip()
         if not keyword:
             self._set_tip("⚠ 请输入搜索关键词", "warning")
             return
         
-        if not load_cf_clearance():
+        if not self._cookie():
             self._set_tip("⚠ 未配置 Cookie，请先配置", "error")
             return
         
@@ -234,11 +304,19 @@ class SearchWindow(QMainWindow):
         self.search_btn.setEnabled(False)
         self.search_btn.setText("搜索中...")
         
-        # 启动搜索线程
-        self.search_thread = SearchThread(keyword)
-        self.search_thread.finished.connect(self.on_search_finished)
-        self.search_thread.progress.connect(self.on_search_progress)
-        self.search_thread.start()
+        # 取消仍在进行的旧搜索，再把新任务提交到线程池
+        self._cancel_current_search()
+        runnable = SearchRunnable(keyword)
+        runnable.signals.finished.connect(self.on_search_finished)
+        runnable.signals.progress.connect(self.on_search_progress)
+        self._current_runnable = runnable
+        self._pool.start(runnable)
+        
+    def _cancel_current_search(self):
+        """取消当前搜索任务（若有）"""
+        if self._current_runnable is not None:
+            self._current_runnable.cancel()
+            self._current_runnable = None
         
     def on_search_progress(self, message: str):
         """搜索进度更新"""
@@ -246,6 +324,7 @@ class SearchWindow(QMainWindow):
         
     def on_search_finished(self, results: List[Dict], error: str):
         """搜索完成"""
+        self._current_runnable = None
         self.search_btn.setEnabled(True)
         self.search_btn.setText("搜  索")
         
@@ -257,20 +336,29 @@ class SearchWindow(QMainWindow):
             self._set_tip("未找到相关书籍", "info")
             return
         
-        # 显示结果
+        # 显示结果（批量插入期间暂停重绘与排序，结束后统一刷新一次）
         self.search_results = results
-        for book in results:
-            title = book.get('title', '未知')
-            author = book.get('author', '未知')
-            latest = book.get('latest', '')
-            
-            display_text = f"{title} - {author}"
-            if latest:
-                display_text += f"  [{latest}]"
-            
-            item = QListWidgetItem(display_text)
-            item.setData(Qt.ItemDataRole.UserRole, book)
-            self.result_list.addItem(item)
+        result_list = self.result_list
+        prev_sort = result_list.isSortingEnabled()
+        result_list.setUpdatesEnabled(False)
+        result_list.setSortingEnabled(False)
+        try:
+            for book in results:
+                title = book.get('title', '未知')
+                author = book.get('author', '未知')
+                latest = book.get('latest', '')
+                
+                if latest:
+                    display_text = f"{title} - {author}  [{latest}]"
+                else:
+                    display_text = f"{title} - {author}"
+                
+                item = QListWidgetItem(display_text)
+                item.setData(Qt.ItemDataRole.UserRole, book)
+                result_list.addItem(item)
+        finally:
+            result_list.setSortingEnabled(prev_sort)
+            result_list.setUpdatesEnabled(True)
         
         self._set_tip(f"✓ 找到 {len(results)} 本书籍，双击或选中后点击导入", "success")
         self.import_btn.setEnabled(True)
@@ -302,25 +390,19 @@ class SearchWindow(QMainWindow):
         self.book_selected.emit(book_url, book_title)
         self.close()
         
+    def closeEvent(self, event):
+        """关闭窗口时丢弃未完成的搜索结果（窗口会被复用，需恢复搜索按钮与提示）"""
+        self._debounce.stop()
+        if self._current_runnable is not None:
+            self._cancel_current_search()
+            # 已取消的任务不会回调 on_search_finished，在此恢复按钮，否则再次打开时无法搜索
+            self.search_btn.setEnabled(True)
+            self.search_btn.setText("搜  索")
+            self._set_tip("搜索已取消", "info")
+        super().closeEvent(event)
+        
     def _set_tip(self, text: str, level: str = "info"):
-        """设置提示信息"""
+        """设置提示信息（样式按级别预生成）"""
         self.tip_label.setText(text)
-        
-        # 根据级别设置颜色
-        if self._night_mode:
-            colors = {
-                "success": "#66bb6a",  # 绿色
-                "warning": "#ffa726",  # 橙色
-                "error": "#ef5350",    # 红色
-                "info": "#d0d0d0"      # 默认文字色
-            }
-        else:
-            colors = {
-                "success": "#2e7d32",  # 深绿
-                "warning": "#f57c00",  # 深橙
-                "error": "#c62828",    # 深红
-                "info": "#5D4E37"      # 默认文字色
-            }
-        
-        color = colors.get(level, colors["info"])
-        self.tip_label.setStyleSheet(f"color: {color}; padding: 4px 0;")
+        styles = self._tip_styles
+        self.tip_label.setStyleSheet(styles.get(level) or styles["info"])
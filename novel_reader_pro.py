@@ -1,38 +1,39 @@
 __version__ = "1.3.0"
 import sys
 
-import re
-import time
-import shutil
+import json
+from time import monotonic_ns
 import logging
+from collections import OrderedDict
 from pathlib import Path
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QListWidget, QListWidgetItem, QTextBrowser, QPushButton, QLabel,
+    QListWidget, QListView, QTextBrowser, QPushButton, QLabel,
     QLineEdit, QMessageBox, QSpinBox, QCheckBox,
     QInputDialog, QToolBar, QStatusBar, QProgressDialog
 )
-from PySide6.QtGui import QFont, QAction, QTextOption, QKeySequence, QShortcut
-from PySide6.QtCore import Qt, QTimer, Signal
-# 可选引入：WebEngine 用于真·直排（writing-mode）
-try:
-    from PySide6.QtWebEngineWidgets import QWebEngineView
-    WEBENGINE_AVAILABLE = True
-except Exception:
-    WEBENGINE_AVAILABLE = False
-from runlog import setup_app_logger
+from PySide6.QtGui import QFont, QAction, QTextOption, QKeySequence
+from PySide6.QtCore import (
+    Qt, QTimer, QThreadPool, QSignalBlocker, Signal, QAbstractListModel, QModelIndex
+)
+from runlog import setup_app_logger, flush_app_logger
 from analysis_index import (
-    fetch_html, 
     load_json,
-    save_json,
-    extract_book_title_from_html,
+    save_json_if_changed,
+    save_json_in_background,
+    flush_background_saves,
     process_chapter_content_for_display,
+    chapter_body_html,
+    chapter_style_css,
     create_book_directory_and_debug,
 
     create_book_metadata,
-    IndexFetchThread,
-    ChapterFetchThread
+    generate_book_id_from_url,
+    IndexFetchRunnable,
+    ChapterFetchRunnable,
+    BackgroundSaveSignals,
+    RemoveDirRunnable
 )
 # 导入样式
 from styles import DARK_STYLE, LIGHT_STYLE, wrap_vertical_html
@@ -63,6 +64,8 @@ BOOKS_DIR.mkdir(parents=True, exist_ok=True)
 
 LIB_FILE = APP_DIR / "library.json"
 SETTINGS_FILE = APP_DIR / "settings.json"
+# 阅读位置单独存放（{bid: chapter_index}）：翻章只重写这个小文件，不必重写整个书库
+POSITIONS_FILE = APP_DIR / "positions.json"
 
 setup_app_logger(str(APP_DIR / "app.log") ,add_console=True) #是否开启控制台日志输出
 logging.info("应用启动")
@@ -78,9 +81,53 @@ DEFAULT_SETTINGS = {
     "bg_color": "#D2B48C",
     "vertical_mode": False
 }
+# 渲染热路径上使用的默认值，避免每次查 DEFAULT_SETTINGS
+_DEFAULT_FONT = DEFAULT_SETTINGS["font_family"]
+_DEFAULT_TEXT_COLOR = DEFAULT_SETTINGS["text_color"]
 
 library = load_json(LIB_FILE, {})
 settings = load_json(SETTINGS_FILE, DEFAULT_SETTINGS.copy())
+positions = load_json(POSITIONS_FILE, {})
+
+
+def _migrate_book_ids(library):
+    """
+    旧版本以加盐的 hash(url) 作为书籍 ID，同一网址每次启动得到不同 ID；
+    将这类条目改用稳定 ID（保持书籍顺序），并同步重命名 books 下的缓存目录。返回是否有改动
+    """
+    # 所有 ID 都已与网址对应时直接返回，不触碰文件系统
+    if all(generate_book_id_from_url(meta["index_url"]) == bid
+           for bid, meta in library.items()
+           if isinstance(meta, dict) and meta.get("index_url")):
+        return False
+    books_dir = BOOKS_DIR.resolve()
+    migrated = {}
+    changed = False
+    for old_bid, meta in library.items():
+        url = meta.get("index_url") if isinstance(meta, dict) else None
+        new_bid = generate_book_id_from_url(url) if url else old_bid
+        if new_bid == old_bid or new_bid in library or new_bid in migrated:
+            migrated[old_bid] = meta
+            continue
+        old_dir = Path(meta.get("book_dir") or "")
+        if old_dir.name == old_bid and old_dir.parent.resolve() == books_dir:
+            new_dir = books_dir / new_bid
+            try:
+                if old_dir.exists():
+                    old_dir.rename(new_dir)
+                meta["book_dir"] = str(new_dir)
+            except OSError as e:
+                logging.warning(f"迁移书籍目录失败，保留旧 ID: bid={old_bid}, error={e}")
+                migrated[old_bid] = meta
+                continue
+        migrated[new_bid] = meta
+        changed = True
+        logging.info(f"书籍 ID 已迁移: {old_bid} -> {new_bid}")
+    if changed:
+        library.clear()
+        library.update(migrated)
+    return changed
+
 
 # 自定义文本浏览器，支持手势翻页
 class GestureTextBrowser(QTextBrowser):
@@ -111,7 +158,7 @@ class GestureTextBrowser(QTextBrowser):
             at_bottom = val >= (maxv - edge_tol)
 
             delta = event.angleDelta().y()
-            now_ms = time.monotonic() * 1000
+            now_ms = monotonic_ns() // 1_000_000  # 整数毫秒，避免每次滚轮事件的浮点运算
 
             # 进入边缘时记录时间，用于滞后判定
             if at_top:
@@ -135,39 +182,35 @@ class GestureTextBrowser(QTextBrowser):
             if (self.accumulated_scroll > 0 and delta < 0) or (self.accumulated_scroll < 0 and delta > 0):
                 self.accumulated_scroll = 0
 
-            # 顶部向上：上一章（增加滞后与小幅对齐保护）
+            # 边缘方向：1 = 顶部继续向上（上一章），-1 = 底部继续向下（下一章），0 = 非翻页手势
             if at_top and delta > 0:
-                # 小幅滚动用于对齐，直接消费不累积，避免误触发上一章
-                if delta < self.small_scroll_ignore or (self.top_enter_time and (now_ms - self.top_enter_time) < 250):
-                    event.accept()
-                    return
-                self.accumulated_scroll += delta
-                if self.accumulated_scroll >= self.prev_threshold:
-                    self.prev_chapter_requested.emit()
-                    self.accumulated_scroll = 0
-                    self.last_gesture_time = now_ms
-                    event.accept()
-                    return
-                else:
-                    # 边缘对齐保护
-                    event.accept()
-                    return
+                edge = 1
+            elif at_bottom and delta < 0:
+                edge = -1
+            else:
+                edge = 0
 
-            # 底部向下：下一章（更灵敏）
-            if at_bottom and delta < 0:
-                if abs(delta) < self.small_scroll_ignore or (self.bottom_enter_time and (now_ms - self.bottom_enter_time) < 120):
-                    event.accept()
+            if edge:
+                # 到达边缘后的滚动一律消费（边缘对齐保护），只在累积够阈值时翻章
+                event.accept()
+                if edge > 0:
+                    enter_time, settle_ms, threshold = self.top_enter_time, 250, self.prev_threshold
+                else:
+                    # 底部更灵敏：滞后更短、阈值更低
+                    enter_time, settle_ms, threshold = self.bottom_enter_time, 120, self.next_threshold
+                magnitude = abs(delta)
+                # 小幅滚动或刚进入边缘的滚动用于对齐，直接消费不累积，避免误翻章
+                if magnitude < self.small_scroll_ignore or (enter_time and now_ms - enter_time < settle_ms):
                     return
-                self.accumulated_scroll += abs(delta)
-                if self.accumulated_scroll >= self.next_threshold:
-                    self.next_chapter_requested.emit()
+                self.accumulated_scroll += magnitude
+                if self.accumulated_scroll >= threshold:
                     self.accumulated_scroll = 0
                     self.last_gesture_time = now_ms
-                    event.accept()
-                    return
-                else:
-                    event.accept()
-                    return
+                    if edge > 0:
+                        self.prev_chapter_requested.emit()
+                    else:
+                        self.next_chapter_requested.emit()
+                return
 
             # 非边缘正常滚动
             self.accumulated_scroll = 0
@@ -175,13 +218,75 @@ class GestureTextBrowser(QTextBrowser):
         except Exception:
             super().wheelEvent(event)
 
-# 直排专用 Web 视图：将鼠标滚轮纵向滚动转换为横向滚动，符合 vertical-rl 的阅读习惯
-if 'WEBENGINE_AVAILABLE' in globals() and WEBENGINE_AVAILABLE:
+# 章节目录模型：直接以书籍的章节列表为数据源，不为每一章创建 QListWidgetItem，
+# 视图只为可见行取数据，数万章的书也能瞬间显示目录
+class ChapterListModel(QAbstractListModel):
+    def __init__(self, chapters=None, parent=None):
+        super().__init__(parent)
+        self._chapters = chapters if chapters is not None else []
+        # 显示文本按行惰性生成并缓存：视图每次重绘都会重复请求可见行的 DisplayRole
+        self._display = [None] * len(self._chapters)
+
+    def set_chapters(self, chapters):
+        """整体替换章节数据源"""
+        self.beginResetModel()
+        self._chapters = chapters
+        self._display = [None] * len(chapters)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._chapters)
+
+    def data(self, index, role=Qt.DisplayRole):
+        row = index.row()
+        if not index.isValid() or row >= len(self._chapters):
+            return None
+        if role == Qt.DisplayRole:
+            text = self._display[row]
+            if text is None:
+                ch = self._chapters[row]
+                idx = ch.get('index')
+                text = self._display[row] = "%s. %s" % ('?' if idx is None else idx, ch.get('title') or '')
+            return text
+        if role == Qt.UserRole:
+            return self._chapters[row].get('index')
+        return None
+
+# 直排页面定位到最右侧（vertical-rl 下的文章开头）
+_VERTICAL_SCROLL_JS = "window.scrollTo({left: document.documentElement.scrollWidth, top: 0, behavior: 'auto'});"
+
+# 可选引入：WebEngine 用于真·直排（writing-mode）
+# 加载 Chromium 开销较大，推迟到首次启用直排时再导入；None 表示尚未探测
+WEBENGINE_AVAILABLE = None
+VerticalWebView = None
+
+
+def _load_vertical_webview():
+    """按需导入 QtWebEngine 并定义 VerticalWebView，不可用时返回 None（探测结果缓存）"""
+    global WEBENGINE_AVAILABLE, VerticalWebView
+    if WEBENGINE_AVAILABLE is not None:
+        return VerticalWebView
+    try:
+        from PySide6.QtWebEngineWidgets import QWebEngineView
+    except Exception:
+        WEBENGINE_AVAILABLE = False
+        return None
+
+    # 直排专用 Web 视图：将鼠标滚轮纵向滚动转换为横向滚动，符合 vertical-rl 的阅读习惯
     class VerticalWebView(QWebEngineView):
         # 在竖排中使用滚轮切章所需的信号
         prev_chapter_requested = Signal()
         next_chapter_requested = Signal()
 
+        # 滚动位置探测脚本（常量，拼接在滚动语句之后，作为整段脚本的返回值）
+        _JS_PROBE = (
+            "(()=>{const de=document.documentElement;"
+            "return JSON.stringify({x:de.scrollLeft,w:de.scrollWidth,cw:de.clientWidth});})()"
+        )
+        # 水平滚动语句：两段常量中间拼接步长
+        _JS_SCROLL_HEAD = "window.scrollBy({left:"
+        _JS_SCROLL_TAIL = ",top:0,behavior:'auto'});"
+
         def __init__(self, parent=None):
             super().__init__(parent)
             # 滚轮切章的冷却控制，避免误触发
@@ -192,24 +297,30 @@ if 'WEBENGINE_AVAILABLE' in globals() and WEBENGINE_AVAILABLE:
             self._next_ticks_needed = 4
             self._prev_tick_counter = 0
             self._next_tick_counter = 0
+            # 滚轮计数：未处于边缘累计时，每 3 次滚动才探测一次滚动位置
+            self._wheel_ticks = 0
 
         def wheelEvent(self, event):
             try:
                 # 将纵向滚轮映射为水平滚动：向上滚轮 => 向右滚动（上一列），向下滚轮 => 向左滚动（下一列）
                 delta_y = event.angleDelta().y()
                 step = int(delta_y * 0.6)  # 已修正方向：下(负) -> 向左；上(正) -> 向右
-                # 先执行滚动
-                self.page().runJavaScript(f"window.scrollBy({{left: {step}, top: 0, behavior: 'auto'}});")
+                self._wheel_ticks += 1
+                js_scroll = self._JS_SCROLL_HEAD + str(step) + self._JS_SCROLL_TAIL
+                probe = self._prev_tick_counter > 0 or self._next_tick_counter > 0 or self._wheel_ticks % 3 == 0
+                if not probe:
+                    # 仅滚动，不回读位置
+                    self.page().runJavaScript(js_scroll)
+                    event.accept()
+                    return
 
                 # 边缘检测 + 冷却判断（异步读取滚动位置）
-                import time as _t
-                now_ms = int(_t.monotonic() * 1000)
+                now_ms = monotonic_ns() // 1_000_000
                 cooldown_active = (now_ms - self._last_gesture_ts) < self._gesture_cooldown_ms
 
                 def _edge_check_cb(res):
                     # res 为 JSON 字符串，包含 x(滚动X), w(scrollWidth), cw(clientWidth)
                     try:
-                        import json
                         data = json.loads(res) if isinstance(res, str) else res
                         x = int(data.get("x", 0))
                         w = int(data.get("w", 0))
@@ -244,33 +355,53 @@ if 'WEBENGINE_AVAILABLE' in globals() and WEBENGINE_AVAILABLE:
                     except Exception:
                         pass
 
-                js_probe = """
-(() => {
-  const de = document.documentElement;
-  return JSON.stringify({x: de.scrollLeft, w: de.scrollWidth, cw: de.clientWidth});
-})()
-"""
-                self.page().runJavaScript(js_probe, _edge_check_cb)
+                # 滚动与位置探测合并为一次 JS 调用，减少与渲染进程的往返
+                self.page().runJavaScript(js_scroll + self._JS_PROBE, _edge_check_cb)
                 event.accept()
             except Exception:
                 super().wheelEvent(event)
-else:
-    VerticalWebView = None
+
+    WEBENGINE_AVAILABLE = True
+    return VerticalWebView
+
 
 class NovelReaderSidebarFixed(QMainWindow):
+    # 渲染结果缓存容量（章节数）
+    RENDER_CACHE_SIZE = 64
+    # 已加载章节数据的内存缓存容量（章节数）
+    CHAPTER_CACHE_SIZE = 32
+    # 当前章节加载后向后预取的章节数
+    PREFETCH_AHEAD = 3
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("小说阅读器")
         self.resize(1100, 720)
         self.library = library
         self.settings = settings
+        self.positions = positions
         self.current_book_id = None
         self.current_chapters = []
         self.current_book_dir = None
+        # 当前书籍的章节缓存目录（open_book 时计算一次）
+        self._chapters_cache_dir = None
         self.chapter_by_idx = {}
-        self.fetch_thread = None
-        self.index_thread = None
+        # 章节搜索索引：与章节列表逐行对应
+        self._chapter_titles_lower = []
+        self._chapter_row_by_num = {}
+        # 章节列表当前内容的签名（书籍, 列表对象, 章节数, 首/末章索引），未变化时跳过模型重置
+        self._chapter_list_signature = None
+        # 导航栏上次显示的 (阅读位置, 章节总数)，未变化时跳过按钮/标签更新；None 表示初始的“章节 0/0”
+        self._last_nav_state = None
+        # 后台任务统一提交到全局线程池
+        self._pool = QThreadPool.globalInstance()
+        self._active_fetches = {}  # 章节索引 -> ChapterFetchRunnable
+        self._prefetch_tasks = {}  # 章节索引 -> 预取中的 ChapterFetchRunnable
+        self._index_task = None
         self.progress_dialog = None
+        # 当前窗口已应用的主题样式表（DARK_STYLE / LIGHT_STYLE 常量本身，按对象身份比较）
+        self._applied_qss = None
+        self._search_window_qss = None  # 搜索窗口上次同步的样式表
 
         root = QWidget()
         self.setCentralWidget(root)
@@ -332,10 +463,12 @@ class NovelReaderSidebarFixed(QMainWindow):
         self.chapter_label = QLabel("章节目录")  # 简化标签文字
         self.chapter_label.setMaximumHeight(20)
         left_col.addWidget(self.chapter_label)
-        self.chapter_list = QListWidget()
+        self.chapter_model = ChapterListModel(parent=self)
+        self.chapter_list = QListView()
         self.chapter_list.setUniformItemSizes(True)
-        self.chapter_list.setVerticalScrollMode(QListWidget.ScrollPerPixel)
-        self.chapter_list.itemActivated.connect(self.on_chapter_clicked)
+        self.chapter_list.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.chapter_list.setModel(self.chapter_model)
+        self.chapter_list.activated.connect(self.on_chapter_clicked)
         left_col.addWidget(self.chapter_list, 1)
 
         h.addLayout(left_col, 2)  
@@ -349,22 +482,24 @@ class NovelReaderSidebarFixed(QMainWindow):
         top_controls.addWidget(self.font_label)
         self.font_spin = QSpinBox()
         self.font_spin.setRange(10, 36)
-        self.font_spin.setValue(self.settings.get("font_size", 22))
-        self.font_spin.valueChanged.connect(self.change_font_size)
+        # 连续调整字号（按住箭头/滚轮）时只在停止 150ms 后按最终值渲染一次
+        self._font_debounce = QTimer(self)
+        self._font_debounce.setSingleShot(True)
+        self._font_debounce.setInterval(150)
+        self._font_debounce.timeout.connect(self._apply_font_size)
+        self.font_spin.valueChanged.connect(lambda _v: self._font_debounce.start())
         top_controls.addWidget(self.font_spin)
         self.night_cb = QCheckBox("夜间")
-        self.night_cb.setChecked(self.settings.get("night_mode", False))
         self.night_cb.toggled.connect(self.toggle_night_mode)
         top_controls.addWidget(self.night_cb)
 
         # 直排开关
         self.vertical_cb = QCheckBox("直排")
-        self.vertical_cb.setChecked(self.settings.get("vertical_mode", False))
         self.vertical_cb.toggled.connect(self.toggle_vertical_mode)
         top_controls.addWidget(self.vertical_cb)
         right_col.addLayout(top_controls)
         self.text_browser = GestureTextBrowser()
-        self.base_font = QFont(self.settings.get("font_family", "方正启体简体"), self.settings.get("font_size", 22))
+        self.base_font = QFont(self.settings.get("font_family", _DEFAULT_FONT), self.settings.get("font_size", 22))
         self.text_browser.setFont(self.base_font)
         self.text_browser.setOpenExternalLinks(True)
         self.text_browser.setWordWrapMode(QTextOption.WrapAtWordBoundaryOrAnywhere)
@@ -373,16 +508,11 @@ class NovelReaderSidebarFixed(QMainWindow):
         self.text_browser.next_chapter_requested.connect(self.go_to_next_chapter)
         right_col.addWidget(self.text_browser, 10)
 
-        # WebEngine 视图（用于真·直排）
-        self.web_view = VerticalWebView() if 'WEBENGINE_AVAILABLE' in globals() and WEBENGINE_AVAILABLE and VerticalWebView else None
-        if self.web_view:
-            right_col.addWidget(self.web_view, 10)
-            self.web_view.setVisible(self.settings.get("vertical_mode", False))
-            # 直排视图滚轮切章：连接到主窗口的上一章/下一章
-            if hasattr(self.web_view, "prev_chapter_requested"):
-                self.web_view.prev_chapter_requested.connect(self.go_to_prev_chapter)
-            if hasattr(self.web_view, "next_chapter_requested"):
-                self.web_view.next_chapter_requested.connect(self.go_to_next_chapter)
+        # WebEngine 视图（用于真·直排）：仅在启用直排时才创建
+        self._right_col = right_col
+        self.web_view = None
+        if self.settings.get("vertical_mode", False):
+            self._ensure_vertical_webview()
         # 初始模式下的可见性
         self.text_browser.setVisible(not self.settings.get("vertical_mode", False) or not self.web_view)
         # 添加章节导航按钮
@@ -405,14 +535,33 @@ class NovelReaderSidebarFixed(QMainWindow):
         self.setStatusBar(self.status)
         h.addLayout(right_col, 8)  
         # timers
-        self.save_timer = QTimer(self)
-        self.save_timer.setInterval(3000)
-        self.save_timer.timeout.connect(self._auto_save)
-        self.save_timer.start()
+        # 批量保存：数据首次变脏时启动单次计时，500ms 后统一落盘，期间的后续改动合并到同一次写入；
+        # 不再周期轮询，空闲时没有任何计时器唤醒
+        self._save_batch_timer = QTimer(self)
+        self._save_batch_timer.setSingleShot(True)
+        self._save_batch_timer.setInterval(500)
+        self._save_batch_timer.timeout.connect(self._auto_save)
         self._settings_dirty = False
         self._library_dirty = False
+        self._positions_dirty = False
+        # 各文件上次写入内容的摘要：序列化结果未变化时跳过写盘
+        self._saved_digests = {}
+        # 后台写书库失败时经信号回到界面线程，重新标记书库待保存
+        self._bg_save_signals = BackgroundSaveSignals()
+        self._bg_save_signals.failed.connect(self._on_library_save_failed)
         self._fetching = False
         self._current_raw_content = None
+        self._current_chapter_idx = None
+        # 已渲染章节 HTML 的 LRU 缓存：(书籍, 章节, 内容哈希, 样式参数) -> html（直排时为包装好的整页）
+        self._render_cache = OrderedDict()
+        # 最近显示过的章节数据 LRU：(书籍, 章节) -> 章节 JSON，回看时免去磁盘读取与解析
+        self._chapter_data_cache = OrderedDict()
+        # 横排正文样式放在文档默认样式表中，仅在样式变化时更新
+        self._text_css = None
+        # 渲染样式参数缓存，设置变更时清空
+        self._style_cache = None
+        # 当前视图中已渲染内容的标识（模式, HTML 哈希[, 样式表]），相同时 render_html 跳过
+        self._rendered_key = None
 
         tb = QToolBar("工具")
         self.addToolBar(tb)
@@ -435,29 +584,39 @@ class NovelReaderSidebarFixed(QMainWindow):
         self._setup_shortcuts()
         
         self.refresh_book_select_list()
+        self._apply_all_settings()
+
+    def _apply_all_settings(self):
+        """
+        将设置一次性同步到控件并应用样式：赋值期间屏蔽控件信号，
+        避免 change_font_size / toggle_night_mode / toggle_vertical_mode 逐个触发重渲染与保存
+        """
+        s = self.settings
+        with QSignalBlocker(self.font_spin):
+            self.font_spin.setValue(s.get("font_size", 22))
+        with QSignalBlocker(self.night_cb):
+            self.night_cb.setChecked(s.get("night_mode", False))
+        with QSignalBlocker(self.vertical_cb):
+            self.vertical_cb.setChecked(s.get("vertical_mode", False))
         self.apply_night_mode(self.night_cb.isChecked())
         
     def _setup_shortcuts(self):
-        """设置键盘快捷键"""
-        # 上一章：左箭头 / PageUp
-        prev_shortcut1 = QShortcut(QKeySequence(Qt.Key_Left), self)
-        prev_shortcut1.activated.connect(self.go_to_prev_chapter)
-        prev_shortcut2 = QShortcut(QKeySequence(Qt.Key_PageUp), self)
-        prev_shortcut2.activated.connect(self.go_to_prev_chapter)
-        
-        # 下一章：右箭头 / PageDown
-        next_shortcut1 = QShortcut(QKeySequence(Qt.Key_Right), self)
-        next_shortcut1.activated.connect(self.go_to_next_chapter)
-        next_shortcut2 = QShortcut(QKeySequence(Qt.Key_PageDown), self)
-        next_shortcut2.activated.connect(self.go_to_next_chapter)
-        
-        # 聚焦搜索框：Ctrl+F
-        search_shortcut = QShortcut(QKeySequence("Ctrl+F"), self)
-        search_shortcut.activated.connect(self.focus_search)
-        
-        # 切换夜间模式：Ctrl+D
-        night_shortcut = QShortcut(QKeySequence("Ctrl+D"), self)
-        night_shortcut.activated.connect(lambda: self.night_cb.setChecked(not self.night_cb.isChecked()))
+        """设置键盘快捷键：同一功能的多个按键共用一个 QAction，不再为每个按键单独创建 QShortcut"""
+        shortcuts = (
+            # 上一章：左箭头 / PageUp
+            ((Qt.Key_Left, Qt.Key_PageUp), self.go_to_prev_chapter),
+            # 下一章：右箭头 / PageDown
+            ((Qt.Key_Right, Qt.Key_PageDown), self.go_to_next_chapter),
+            # 聚焦搜索框：Ctrl+F
+            (("Ctrl+F",), self.focus_search),
+            # 切换夜间模式：Ctrl+D
+            (("Ctrl+D",), lambda: self.night_cb.setChecked(not self.night_cb.isChecked())),
+        )
+        for keys, slot in shortcuts:
+            action = QAction(self)
+            action.setShortcuts([QKeySequence(k) for k in keys])
+            action.triggered.connect(slot)
+            self.addAction(action)
     
     def focus_search(self):
         """聚焦到搜索框"""
@@ -466,27 +625,19 @@ class NovelReaderSidebarFixed(QMainWindow):
     
     def closeEvent(self, event):
         """程序关闭时清理资源"""
-        # 清理章节获取线程（优雅退出）
-        try:
-            t = self.fetch_thread
-            if t and t.isRunning():
-                t.requestInterruption()
-                t.quit()
-                t.wait()
-        except Exception:
-            pass
-        
-        # 清理目录获取线程（优雅退出，兼容自定义 stop）
-        if self.index_thread and self.index_thread.isRunning():
-            try:
-                if hasattr(self.index_thread, "stop"):
-                    self.index_thread.stop()  
-                if hasattr(self.index_thread, "requestInterruption"):
-                    self.index_thread.requestInterruption()
-                self.index_thread.quit()
-                self.index_thread.wait()
-            except Exception:
-                pass
+        # 取消所有后台任务，并限时等待线程池中的任务结束
+        self._cancel_chapter_fetches()
+        self._cancel_prefetches()
+        if self._index_task:
+            self._index_task.cancel()
+            self._index_task = None
+        self._pool.waitForDone(2000)
+
+        # 落实尚未到期的字号调整与待执行的批量保存
+        if self._font_debounce.isActive():
+            self._font_debounce.stop()
+            self._apply_font_size()
+        self._flush_dirty()
         
         # 清理进度弹窗
         if hasattr(self, 'progress_dialog') and self.progress_dialog:
@@ -501,19 +652,25 @@ class NovelReaderSidebarFixed(QMainWindow):
         """刷新书籍列表，显示阅读进度"""
         self.book_select.setUpdatesEnabled(False)
         self.book_select.clear()
+        bids = []
+        texts = []
         for bid, meta in self.library.items():
             title = meta.get("title") or meta.get("index_url") or bid
             # 添加阅读进度信息
-            chapter_index = meta.get("chapter_index", 0)
+            chapter_index = self._reading_position(bid)
             total_chapters = len(meta.get("chapters", []))
             if total_chapters > 0:
                 progress = int((chapter_index + 1) / total_chapters * 100)
                 display_text = f"{title} [{progress}%]"
             else:
                 display_text = title
-            item = QListWidgetItem(display_text)
-            item.setData(Qt.UserRole, bid)
-            self.book_select.addItem(item)
+            bids.append(bid)
+            texts.append(display_text)
+        # 一次性批量创建列表项，再补充 UserRole 数据
+        self.book_select.addItems(texts)
+        item_at = self.book_select.item
+        for row, bid in enumerate(bids):
+            item_at(row).setData(Qt.UserRole, bid)
         self.book_select.setUpdatesEnabled(True)
 
     def import_book_dialog_async(self):
@@ -546,7 +703,7 @@ class NovelReaderSidebarFixed(QMainWindow):
         if self.search_window is not None:
             # 同步夜间模式
             self.search_window.set_night_mode(self.settings.get("night_mode", False))
-            self.search_window.setStyleSheet(self.styleSheet())
+            self._sync_search_window_style()
             self.search_window.show()
             self.search_window.activateWindow()
             self.search_window.raise_()
@@ -556,9 +713,18 @@ class NovelReaderSidebarFixed(QMainWindow):
         self.search_window = SearchWindow(self)
         # 同步夜间模式和样式
         self.search_window.set_night_mode(self.settings.get("night_mode", False))
-        self.search_window.setStyleSheet(self.styleSheet())
+        self._search_window_qss = None
+        self._sync_search_window_style()
         self.search_window.book_selected.connect(self.on_search_book_selected)
         self.search_window.show()
+
+    def _sync_search_window_style(self):
+        """让搜索窗口跟随主窗口主题；样式表未变化时不再重复 setStyleSheet"""
+        qss = self._applied_qss if self._applied_qss is not None else self.styleSheet()
+        if qss is self._search_window_qss:
+            return
+        self.search_window.setStyleSheet(qss)
+        self._search_window_qss = qss
     
     def on_search_book_selected(self, book_url: str, book_title: str):
         """从搜索窗口选择书籍后的处理"""
@@ -579,8 +745,8 @@ class NovelReaderSidebarFixed(QMainWindow):
             book_url, 
             "正在导入目录…", 
             "正在导入", 
-            lambda chapters, error: self._handle_index_fetch_result(
-                chapters, error, is_import=True, url=book_url
+            lambda chapters, title, error: self._handle_index_fetch_result(
+                chapters, error, is_import=True, url=book_url, title=title
             )
         )
     
@@ -600,36 +766,33 @@ class NovelReaderSidebarFixed(QMainWindow):
             return
             
         self._start_index_fetch(url, "正在刷新目录…", "正在刷新", 
-                               lambda chapters, error: self._handle_index_fetch_result(chapters, error, is_import=False))
+                               lambda chapters, title, error: self._handle_index_fetch_result(chapters, error, is_import=False))
 
     def _start_index_fetch(self, url, dialog_message, dialog_title, callback):
         """统一的索引获取启动方法"""
-        if self.index_thread and self.index_thread.isRunning():
+        if self._index_task is not None:
             QMessageBox.information(self, "提示", "目录正在导入/刷新，请稍候")
             return
         
-        # 清理旧的线程对象
-        if self.index_thread:
-            self.index_thread.deleteLater()
-            self.index_thread = None
-        
-        self.index_thread = IndexFetchThread(url)
+        # 任务对象在结果处理完成前一直由 self._index_task 持有，保证信号桥存活
+        task = IndexFetchRunnable(url)
+        self._index_task = task
         self.import_btn.setEnabled(False)
         self.refresh_btn.setEnabled(False)
         
         # 连接信号
-        self.index_thread.progress.connect(lambda s: self.status.showMessage(s, 3000))
-        self.index_thread.finished.connect(callback)
-        self.index_thread.chapter_batch_ready.connect(self._on_chapter_batch_ready)
+        task.signals.progress.connect(lambda s: self.status.showMessage(s, 3000))
+        task.signals.finished.connect(callback)
+        task.signals.chapter_batch_ready.connect(self._on_chapter_batch_ready)
         
         # 显示进度弹窗
         self._show_progress_dialog(dialog_message, dialog_title)
         logging.info(f"开始获取目录: url='{url}'")
         # English: index fetch start
         # logging.info(f"index fetch start: url='{url}'")
-        self.index_thread.start()
+        self._pool.start(task)
 
-    def _handle_index_fetch_result(self, chapters, error, is_import=False, url=None):
+    def _handle_index_fetch_result(self, chapters, error, is_import=False, url=None, title=""):
         """统一的索引获取结果处理方法"""
         # 恢复按钮状态
         self.import_btn.setEnabled(True)
@@ -637,9 +800,7 @@ class NovelReaderSidebarFixed(QMainWindow):
         
         # 清理资源
         self._close_progress_dialog()
-        if self.index_thread:
-            self.index_thread.deleteLater()
-            self.index_thread = None
+        self._index_task = None
         
         # 处理错误
         if error:
@@ -655,22 +816,15 @@ class NovelReaderSidebarFixed(QMainWindow):
         
         try:
             if is_import:
-                self._handle_import_success(url, chapters)
+                self._handle_import_success(url, chapters, title)
             else:
                 self._handle_refresh_success(chapters)
         except Exception as e:
             action = "导入" if is_import else "刷新"
             QMessageBox.warning(self, f"{action}失败", f"处理数据失败：{e}")
 
-    def _handle_import_success(self, url, chapters):
-        """处理导入成功"""
-        # 获取书籍标题
-        try:
-            html_title = fetch_html(url)
-            soup_title = extract_book_title_from_html(html_title)
-        except Exception:
-            soup_title = ""
-        
+    def _handle_import_success(self, url, chapters, soup_title=""):
+        """处理导入成功（soup_title 为目录任务在工作线程中提取的书名）"""
         # 创建书籍元数据
         bid, meta = create_book_metadata(url, chapters, soup_title)
         # 将书籍缓存统一放到应用数据目录下的 books 文件夹
@@ -679,9 +833,11 @@ class NovelReaderSidebarFixed(QMainWindow):
         # 创建目录并保存调试文件
         create_book_directory_and_debug(meta, chapters)
         
-        # 保存到库
+        # 保存到库（重新导入时阅读位置随新目录从头开始）
         self.library[bid] = meta
-        save_json(LIB_FILE, self.library)
+        if self.positions.pop(bid, None) is not None:
+            self._mark_dirty(positions=True)
+        self._save_library()
         self.refresh_book_select_list()
         
         logging.info(f"导入成功: bid={bid}, 标题='{meta.get('title','')}', 章节数={len(chapters)}")
@@ -693,15 +849,14 @@ class NovelReaderSidebarFixed(QMainWindow):
         """处理刷新成功"""
         meta = self.library[self.current_book_id]
         meta["chapters"] = chapters
-        prev_idx = meta.get("chapter_index", 0)
-        if 0 <= prev_idx < len(chapters):
-            meta["chapter_index"] = prev_idx
-        else:
-            meta["chapter_index"] = 0
+        prev_idx = self._reading_position(self.current_book_id)
+        if not 0 <= prev_idx < len(chapters):
+            self.positions[self.current_book_id] = 0
+            self._mark_dirty(positions=True)
         
-        # 保存并更新调试文件
-        save_json(LIB_FILE, self.library)
+        # 更新调试文件（会记录目录摘要）后保存
         create_book_directory_and_debug(meta, chapters)
+        self._save_library()
         
         logging.info(f"目录刷新成功: bid={self.current_book_id}, 章节数={len(chapters)}")
         # English: index refresh success
@@ -718,12 +873,17 @@ class NovelReaderSidebarFixed(QMainWindow):
 
     def open_book(self, bid):
         if bid not in self.library: return
+        if bid != self.current_book_id:
+            # 预取任务按章节索引登记，换书后旧书的同号章节会挡住新书的预取
+            self._cancel_prefetches()
         self.current_book_id = bid
         meta = self.library[bid]
         self.title_label.setText(meta.get("title", "未命名书"))
         self.current_chapters = meta.get("chapters", [])
         self.current_book_dir = Path(meta.get("book_dir"))
+        self._chapters_cache_dir = self.current_book_dir / "chapters"
         self._build_chapter_index_map()
+        self._build_search_index()
         
         logging.info(f"打开书籍: bid={bid}, 章节数={len(self.current_chapters)}")
         # English: open book
@@ -735,23 +895,54 @@ class NovelReaderSidebarFixed(QMainWindow):
         self.render_html("<i>点击左侧章节条目以加载并查看该章节内容（按需抓取并缓存）。</i>")
         self.update_navigation_buttons()
         # 自动定位并加载上次阅读的章节（若存在）
-        idx = meta.get("chapter_index", 0)
+        idx = self._reading_position(bid)
         if self.current_chapters and 0 <= idx < len(self.current_chapters):
             self.load_chapter_by_index(idx)
 
 
 
     def _build_chapter_index_map(self):
-        """构建章节索引到章节数据的映射，便于快速查找"""
+        """
+        构建章节索引到章节数据的映射，便于快速查找：
+        索引稠密（通常为 1..N）时使用列表按下标直取，否则回退到字典
+        """
         try:
-            self.chapter_by_idx = {
-                ch.get('index'): ch
-                for ch in self.current_chapters
-                if isinstance(ch, dict) and 'index' in ch
-            }
+            chapters = [
+                ch for ch in self.current_chapters
+                if isinstance(ch, dict) and isinstance(ch.get('index'), int) and ch['index'] >= 0
+            ]
+            max_idx = max((ch['index'] for ch in chapters), default=-1)
+            if max_idx < 2 * len(chapters):
+                table = [None] * (max_idx + 1)
+                for ch in chapters:
+                    table[ch['index']] = ch
+                self.chapter_by_idx = table
+            else:
+                self.chapter_by_idx = {ch['index']: ch for ch in chapters}
         except Exception:
             self.chapter_by_idx = {}
 
+    def _build_search_index(self):
+        """预先生成与列表行一一对应的小写显示文本及章节号→行号映射，搜索时无需逐项读取列表文本"""
+        chapters = self.current_chapters
+        row_by_num = {}
+        for row, ch in enumerate(chapters):
+            # 章节号重复时保留第一次出现的行
+            row_by_num.setdefault(ch.get('index'), row)
+        self._chapter_row_by_num = row_by_num
+        self._chapter_titles_lower = [
+            f"{ch.get('index', '?')}. {ch.get('title') or ''}".lower() for ch in chapters
+        ]
+
+    def _chapter_for_index(self, index):
+        """按章节索引取章节数据（兼容列表/字典两种映射）"""
+        table = self.chapter_by_idx
+        if isinstance(table, list):
+            if isinstance(index, int) and 0 <= index < len(table):
+                return table[index]
+            return None
+        return table.get(index)
+
     def search_chapter(self):
         """搜索章节（支持章节号和标题关键词）"""
         q = self.chapter_search.text().strip()
@@ -760,84 +951,80 @@ class NovelReaderSidebarFixed(QMainWindow):
             return
         try:
             n = int(q)
-            for i in range(self.chapter_list.count()):
-                it = self.chapter_list.item(i)
-                item_index = it.data(Qt.UserRole)
-                if item_index == n:
-                    self.chapter_list.setCurrentItem(it)
-                    self.chapter_list.scrollToItem(it)
-                    return
-            QMessageBox.information(self, "未找到", f"未找到第 {n} 章")
+        except ValueError:
+            n = None
+        if n is not None:
+            row = self._chapter_row_by_num.get(n)
+            if row is None:
+                QMessageBox.information(self, "未找到", f"未找到第 {n} 章")
+                return
+            self._select_chapter_row(row)
             return
-        except Exception:
-            pass
         # 大小写不敏感搜索
         q_lower = q.lower()
-        matches = []
-        for i in range(self.chapter_list.count()):
-            it = self.chapter_list.item(i)
-            if q_lower in (it.text() or "").lower():
-                matches.append(it)
-        if not matches:
+        row = next((i for i, t in enumerate(self._chapter_titles_lower) if q_lower in t), -1)
+        if row < 0:
             QMessageBox.information(self, "未找到", "未找到匹配章节")
             return
-        self.chapter_list.setCurrentItem(matches[0])
-        self.chapter_list.scrollToItem(matches[0])
+        self._select_chapter_row(row)
+
+    def _select_chapter_row(self, row):
+        """选中并滚动到章节列表的指定行"""
+        idx = self.chapter_model.index(row)
+        if idx.isValid():
+            self.chapter_list.setCurrentIndex(idx)
+            self.chapter_list.scrollTo(idx)
 
-    def on_chapter_clicked(self, item: QListWidgetItem):
+    def on_chapter_clicked(self, index: QModelIndex):
         # 获取章节索引
-        chapter_index = item.data(Qt.UserRole)
+        chapter_index = index.data(Qt.UserRole)
         if chapter_index is None:
             return
         # 抓取进行中则忽略新的点击，避免并发
-        if getattr(self, "_fetching", False):
+        if self._fetching:
             return
         
         # 根据索引查找完整的章节数据（使用映射避免线性遍历）
-        chapter_data = self.chapter_by_idx.get(chapter_index)
+        chapter_data = self._chapter_for_index(chapter_index)
         if chapter_data:
             self.load_chapter_content(chapter_data)
 
     def load_chapter_content(self, chapter_data):
         """加载章节内容的通用方法"""
-        # 停止并清理之前的线程（优雅退出）
-        try:
-            t = self.fetch_thread
-            if t and t.isRunning():
-                t.requestInterruption()
-                t.quit()
-                t.wait()
-        except Exception:
-            pass
-        
-        # 清理旧的线程对象
-        if self.fetch_thread:
-            self.fetch_thread.deleteLater()
-            self.fetch_thread = None
+        # 取消之前未完成的抓取（无需阻塞等待，其结果不再回传）
+        self._cancel_chapter_fetches()
         
         idx = chapter_data.get("index")
         url = chapter_data.get("url")
-        if not url or not re.search(r'\.html$', url):
-            for c in self.current_chapters:
-                if c.get("index") == idx:
-                    url = c.get("url")
-                    break
+        if not url or not url.endswith('.html'):
+            url = (self._chapter_for_index(idx) or {}).get("url") or url
         
-        if not self.current_book_dir:
+        cache_dir = self._chapters_cache_dir
+        if not cache_dir:
             return
             
-        cache_dir = Path(self.current_book_dir) / "chapters"
-        self.fetch_thread = ChapterFetchThread(url, idx, cache_dir)
-        self.fetch_thread.progress.connect(lambda s: self.status.showMessage(s, 5000))
-        self.fetch_thread.finished.connect(self.on_chapter_fetched)
-        self.fetch_thread.finished.connect(self._cleanup_fetch_thread)
+        # 最近看过的章节直接取内存；已缓存到磁盘（例如已预取）的章节同步读取，省去线程池往返
+        cached = self._chapter_data_cache.get((self.current_book_id, idx))
+        if cached is None and isinstance(idx, int):
+            cached = load_json(cache_dir / f"{idx:04d}.json", None)
+        if cached:
+            self._display_chapter(idx, cached)
+            return
+        task = ChapterFetchRunnable(url, idx, cache_dir)
+        # 只连接绑定方法：任务对象随线程池释放后，排队中的信号仍可送达
+        task.signals.progress.connect(self._on_chapter_fetch_progress)
+        task.signals.finished.connect(self.on_chapter_fetched)
+        self._active_fetches[idx] = task
         self._fetching = True
         logging.info(f"开始抓取章节: index={idx}, url='{url}'")
         # English: chapter fetch start
         # logging.info(f"chapter fetch start: index={idx}, url='{url}'")
-        self.fetch_thread.start()
+        self._pool.start(task)
 
     def on_chapter_fetched(self, index, data, error):
+        # 已被取消/替换的抓取结果直接丢弃
+        if self._active_fetches.pop(index, None) is None:
+            return
         if error:
             QMessageBox.warning(self, "抓取失败", f"第 {index} 章抓取失败：{error}")
             logging.info(f"抓取章节失败: index={index}, error={error}")
@@ -845,52 +1032,142 @@ class NovelReaderSidebarFixed(QMainWindow):
             # logging.info(f"chapter fetch failed: index={index}, error={error}")
             self._fetching = False
             return
+        self._display_chapter(index, data)
+
+    def _display_chapter(self, index, data):
+        """显示已获取的章节内容，并在后台预取下一章"""
         title = data.get("title") or f"第{index}章"
         content = data.get("content") or ""
+        cache = self._chapter_data_cache
+        key = (self.current_book_id, index)
+        cache[key] = data
+        cache.move_to_end(key)
+        if len(cache) > self.CHAPTER_CACHE_SIZE:
+            cache.popitem(last=False)
         self.title_label.setText(f"{self.library[self.current_book_id].get('title','')} — {title}")
         
-        # 使用analysis_index.py中的函数处理章节内容
-        html = process_chapter_content_for_display(
-            content,
-            self.settings.get("font_family", DEFAULT_SETTINGS["font_family"]),
-            self.settings.get("font_size", 22),
-            self.settings.get("line_height", 1.6),
-            self.settings.get("night_mode", False),
-            self.settings.get("text_color", DEFAULT_SETTINGS["text_color"])
-        )
+        # 使用analysis_index.py中的函数处理章节内容（命中缓存时直接复用）
+        html = self._chapter_html(content, index)
         
         # 章节切换时重置滚动位置到顶部
-        self.render_html(html, reset_scroll=True)
+        self.render_html(html, reset_scroll=True, wrapped=True)
         self._current_raw_content = content
-        self.library[self.current_book_id]["chapter_index"] = index - 1
-        self._library_dirty = True
+        self._current_chapter_idx = index
+        self.positions[self.current_book_id] = index - 1
+        self._mark_dirty(positions=True)
         self._fetching = False
         self.status.showMessage(f"已加载第 {index} 章", 4000)
         logging.info(f"章节加载完成: index={index}, 标题='{title}'")
         # English: chapter loaded
         # logging.info(f"chapter loaded: index={index}, title='{title}'")
         self.update_navigation_buttons()
+        # 预取窗口：后 PREFETCH_AHEAD 章与上一章；跳转后窗口外尚未完成的预取直接取消
+        self._cancel_prefetches(keep=range(index - 1, index + 1 + self.PREFETCH_AHEAD))
+        for ahead in range(index + 1, index + 1 + self.PREFETCH_AHEAD):
+            self._prefetch_chapter(ahead)
+        self._prefetch_chapter(index - 1)
+
+    def _prefetch_chapter(self, index):
+        """后台预取指定章节到磁盘缓存（不更新界面），顺序阅读时"下一章"可直接命中缓存"""
+        chapter = self._chapter_for_index(index)
+        cache_dir = self._chapters_cache_dir
+        if not chapter or not cache_dir or index in self._prefetch_tasks:
+            return
+        url = chapter.get("url")
+        if not url or (cache_dir / f"{index:04d}.json").exists():
+            return
+        task = ChapterFetchRunnable(url, index, cache_dir, prefetch=True)
+        task.signals.finished.connect(self._on_prefetch_done)
+        self._prefetch_tasks[index] = task
+        # 低于默认优先级：用户点击触发的章节抓取总是先于预取执行
+        self._pool.start(task, -1)
+
+    def _cancel_prefetches(self, keep=()):
+        """取消章节索引不在 keep 中的预取任务（已排队的任务不会再发起请求）"""
+        for index in [i for i in self._prefetch_tasks if i not in keep]:
+            self._prefetch_tasks.pop(index).cancel()
+
+    def _on_prefetch_done(self, index, data, error):
+        self._prefetch_tasks.pop(index, None)
+        if error:
+            logging.info(f"预取章节失败: index={index}, error={error}")
 
-    def _cleanup_fetch_thread(self, *args):
-        """线程完成后的安全清理：避免访问已删除的 C++ 对象"""
-        try:
-            t = self.fetch_thread
-            self.fetch_thread = None
-            if t:
-                t.deleteLater()
-        except Exception:
-            pass
+    def _current_style_tuple(self):
+        """
+        当前渲染样式参数 (字体, 字号, 行高, 夜间, 文字颜色, 背景色)；
+        结果缓存到设置下次变更（_mark_dirty(settings=True) 时失效）
+        """
+        style = self._style_cache
+        if style is None:
+            s = self.settings
+            style = self._style_cache = (
+                s.get("font_family", _DEFAULT_FONT),
+                s.get("font_size", 22),
+                s.get("line_height", 1.6),
+                s.get("night_mode", False),
+                s.get("text_color", _DEFAULT_TEXT_COLOR),
+                s.get("bg_color", "#ffffff"),
+            )
+        return style
+
+    def _chapter_html(self, content, index=None):
+        """
+        将章节原文处理为显示用 HTML，按书籍/章节/样式缓存（LRU）：
+          - 横排：只生成与样式无关的正文片段，样式由文档默认样式表提供；
+          - 直排：生成带内联样式的片段并用 wrap_vertical_html 包装成整页，render_html 直接使用
+        内容哈希随字符串对象缓存，同一章节重复渲染时查找不会重新扫描全文
+        """
+        style = self._current_style_tuple()
+        vertical = bool(self.settings.get("vertical_mode", False) and self.web_view)
+        if not vertical:
+            self._apply_text_style(style)
+        style_key = style if vertical else None
+        key = (self.current_book_id, index, hash(content), style_key)
+        cache = self._render_cache
+        html = cache.get(key)
+        if html is not None:
+            cache.move_to_end(key)
+        else:
+            if vertical:
+                html = wrap_vertical_html(process_chapter_content_for_display(content, *style[:5]), *style)
+            else:
+                html = f'<div class="chapter">{chapter_body_html(content)}</div>'
+            cache[key] = html
+            if len(cache) > self.RENDER_CACHE_SIZE:
+                cache.popitem(last=False)
+        return html
+
+    def _apply_text_style(self, style):
+        """更新横排文档的默认样式表（样式未变化时跳过）"""
+        css = chapter_style_css(*style[2:5])
+        if css != self._text_css:
+            self.text_browser.document().setDefaultStyleSheet(css)
+            self._text_css = css
+
+    def _on_chapter_fetch_progress(self, message):
+        self.status.showMessage(message, 5000)
+
+    def _cancel_chapter_fetches(self):
+        """取消所有进行中的章节抓取任务"""
+        for task in self._active_fetches.values():
+            task.cancel()
+        self._active_fetches.clear()
 
     def update_navigation_buttons(self):
-        """更新导航按钮状态和章节信息"""
+        """更新导航按钮状态和章节信息（状态未变化时不触碰控件）"""
         if not self.current_book_id or not self.current_chapters:
-            self.prev_btn.setEnabled(False)
-            self.next_btn.setEnabled(False)
-            self.chapter_info.setText("章节 0/0")
+            if self._last_nav_state is not None:
+                self.prev_btn.setEnabled(False)
+                self.next_btn.setEnabled(False)
+                self.chapter_info.setText("章节 0/0")
+                self._last_nav_state = None
             return
         
-        current_index = self.library[self.current_book_id].get("chapter_index", 0)
+        current_index = self._reading_position(self.current_book_id)
         total_chapters = len(self.current_chapters)
+        if self._last_nav_state == (current_index, total_chapters):
+            return
+        self._last_nav_state = (current_index, total_chapters)
         
         # 更新按钮状态
         self.prev_btn.setEnabled(current_index > 0)
@@ -904,7 +1181,14 @@ class NovelReaderSidebarFixed(QMainWindow):
         """获取当前章节在列表中的索引"""
         if not self.current_book_id:
             return -1
-        return self.library[self.current_book_id].get("chapter_index", 0)
+        return self._reading_position(self.current_book_id)
+
+    def _reading_position(self, bid):
+        """书籍的阅读位置（章节列表下标）；positions.json 中没有时沿用书库里旧版本记录的 chapter_index"""
+        pos = self.positions.get(bid)
+        if pos is None:
+            pos = self.library[bid].get("chapter_index", 0)
+        return pos
 
     def load_chapter_by_index(self, chapter_index):
         """根据索引加载章节"""
@@ -913,15 +1197,8 @@ class NovelReaderSidebarFixed(QMainWindow):
         
         chapter = self.current_chapters[chapter_index]
         
-        # 更新章节列表选中状态
-        target_index = chapter.get("index")
-        for i in range(self.chapter_list.count()):
-            item = self.chapter_list.item(i)
-            item_index = item.data(Qt.UserRole)
-            if item_index == target_index:
-                self.chapter_list.setCurrentItem(item)
-                self.chapter_list.scrollToItem(item)
-                break
+        # 更新章节列表选中状态：模型行与 current_chapters 一一对应，行号即位置，O(1) 定位
+        self._select_chapter_row(chapter_index)
         
         # 加载章节内容
         self.on_chapter_clicked_by_data(chapter)
@@ -959,34 +1236,34 @@ class NovelReaderSidebarFixed(QMainWindow):
     # ========== 直排渲染相关 ==========
 
 
-    def render_html(self, html, reset_scroll=False):
+    def render_html(self, html, reset_scroll=False, wrapped=False):
         """按当前模式渲染 HTML 到合适的视图
         
         参数:
             html: 要渲染的HTML内容
             reset_scroll: 是否重置滚动位置到顶部（切换章节时应为True）
+            wrapped: html 来自 _chapter_html（直排时已是包装好的整页，不再包装）
         """
         vertical = self.settings.get("vertical_mode", False)
-        if vertical and getattr(self, 'web_view', None):
-            vhtml = wrap_vertical_html(
-                html,
-                self.settings.get("font_family", DEFAULT_SETTINGS["font_family"]),
-                self.settings.get("font_size", 22),
-                self.settings.get("line_height", 1.6),
-                self.settings.get("night_mode", False),
-                self.settings.get("text_color", DEFAULT_SETTINGS["text_color"]),
-                self.settings.get("bg_color", "#ffffff"),
-            )
-            # 避免空白过渡导致闪烁，直接渲染目标内容
-            self.web_view.setHtml(vhtml)
-            # 直排下默认定位到最右侧（文章开头）
-            try:
-                QTimer.singleShot(60, lambda: self.web_view.page().runJavaScript(
-                    "window.scrollTo({left: document.documentElement.scrollWidth, top: 0, behavior: 'auto'});"
-                ))
-            except Exception:
-                pass
+        if vertical and self.web_view:
+            vhtml = html if wrapped else wrap_vertical_html(html, *self._current_style_tuple())
+            # 与当前显示内容相同时不再 setHtml（避免整页重新排版），仅在切换章节时复位滚动
+            key = ("v", hash(vhtml))
+            if key != self._rendered_key:
+                self._rendered_key = key
+                # 避免空白过渡导致闪烁，直接渲染目标内容；加载完成后由 _on_vertical_page_loaded 定位到文章开头
+                self.web_view.setHtml(vhtml)
+            elif reset_scroll:
+                # 页面未重新加载：直接定位到最右侧（文章开头）
+                self.web_view.page().runJavaScript(_VERTICAL_SCROLL_JS)
         else:
+            # 正文片段与文档默认样式表都未变化时跳过 setHtml
+            key = ("h", hash(html), self._text_css)
+            if key == self._rendered_key:
+                if reset_scroll:
+                    self.text_browser.verticalScrollBar().setValue(0)
+                return
+            self._rendered_key = key
             # 横排模式：根据reset_scroll参数决定是否保留滚动位置
             if reset_scroll:
                 # 切换章节时：重置到顶部
@@ -1017,76 +1294,104 @@ class NovelReaderSidebarFixed(QMainWindow):
                 except Exception:
                     pass
 
+    def _ensure_vertical_webview(self):
+        """首次需要直排时导入 WebEngine 并创建视图，返回视图；环境不支持时返回 None"""
+        if self.web_view is None:
+            view_cls = _load_vertical_webview()
+            if view_cls is None:
+                return None
+            self.web_view = view_cls()
+            # 紧随 QTextBrowser 之后插入，与原布局位置一致
+            self._right_col.insertWidget(self._right_col.indexOf(self.text_browser) + 1, self.web_view, 10)
+            # 直排视图滚轮切章：连接到主窗口的上一章/下一章
+            self.web_view.prev_chapter_requested.connect(self.go_to_prev_chapter)
+            self.web_view.next_chapter_requested.connect(self.go_to_next_chapter)
+            self.web_view.loadFinished.connect(self._on_vertical_page_loaded)
+        return self.web_view
+
+    def _on_vertical_page_loaded(self, ok):
+        """直排页面加载完成：定位到最右侧（文章开头）"""
+        if ok and self.settings.get("vertical_mode", False):
+            self.web_view.page().runJavaScript(_VERTICAL_SCROLL_JS)
+
     def toggle_vertical_mode(self, on):
         """切换直排模式"""
+        # 状态未变化（如控件状态回弹）时不做任何重渲染
+        if bool(self.settings.get("vertical_mode", False)) == on:
+            return
         self.settings["vertical_mode"] = on
-        self._settings_dirty = True
-        if getattr(self, 'web_view', None):
-            self.web_view.setVisible(on)
+        self._mark_dirty(settings=True)
+        if on:
+            self._ensure_vertical_webview()
+        web_view = self.web_view
+        if web_view:
+            web_view.setVisible(on)
         # 无 WebEngine 时仍显示 QTextBrowser
-        self.text_browser.setVisible(not on or not getattr(self, 'web_view', None))
-        if on and not getattr(self, 'web_view', None):
+        self.text_browser.setVisible(not on or not web_view)
+        if on and not web_view:
             QMessageBox.information(self, "直排不可用", "当前环境未检测到 WebEngine 组件，已继续使用横排显示。如需直排，请安装 PySide6（包含 QtWebEngine）后重启应用。")
 
-        # 重新渲染当前内容（样式切换，保留滚动位置）
-        if getattr(self, "_current_raw_content", None) is not None:
-            html = process_chapter_content_for_display(
-                self._current_raw_content,
-                self.settings.get("font_family", DEFAULT_SETTINGS["font_family"]),
-                self.settings.get("font_size", 22),
-                self.settings.get("line_height", 1.6),
-                self.settings.get("night_mode", False),
-                self.settings.get("text_color", DEFAULT_SETTINGS["text_color"])
-            )
-            self.render_html(html, reset_scroll=False)
-        elif getattr(self, 'web_view', None) and on:
-            self.web_view.setHtml("")
+        # 重新渲染当前内容（样式切换，保留滚动位置）；无内容时仅切换可见性，直排视图保持原样，
+        # 下次 render_html 会整体覆盖
+        if self._current_raw_content is not None:
+            html = self._chapter_html(self._current_raw_content, self._current_chapter_idx)
+            self.render_html(html, reset_scroll=False, wrapped=True)
+
+    def _apply_font_size(self):
+        """字号防抖到期：按字号框当前值应用（与已生效字号相同时跳过）"""
+        v = self.font_spin.value()
+        if v != self.settings.get("font_size"):
+            self.change_font_size(v)
 
     def change_font_size(self, v):
         self.settings["font_size"] = v
-        self._settings_dirty = True
+        self._mark_dirty(settings=True)
         self.base_font.setPointSize(v)
+        # 横排：字号来自控件字体（文档默认字体），setFont 只触发重新排版，无需重新生成/解析 HTML
         self.text_browser.setFont(self.base_font)
-        # 重新渲染当前内容（使用原始文本，保持一致性，保留滚动位置）
-        if getattr(self, "_current_raw_content", None) is not None:
-            html = process_chapter_content_for_display(
-                self._current_raw_content,
-                self.settings.get("font_family", DEFAULT_SETTINGS["font_family"]),
-                self.settings.get("font_size", 22),
-                self.settings.get("line_height", 1.6),
-                self.settings.get("night_mode", False),
-                self.settings.get("text_color", DEFAULT_SETTINGS["text_color"])
+        if self._current_raw_content is not None and self.settings.get("vertical_mode", False) and self.web_view:
+            # 直排：就地修改页面正文容器的字号，不重新加载整页
+            self.web_view.page().runJavaScript(
+                f"(()=>{{const d=document.querySelector('.vwrap>div');if(d)d.style.fontSize='{v}pt';}})()"
             )
-            self.render_html(html, reset_scroll=False)
+            # 页面已被脚本修改，与记录的渲染标识不再一致
+            self._rendered_key = None
 
     def toggle_night_mode(self, on):
+        if bool(self.settings.get("night_mode", False)) == on:
+            return
         self.settings["night_mode"] = on
-        self._settings_dirty = True
+        self._mark_dirty(settings=True)
         self.apply_night_mode(on)
-        # 夜间模式切换后，基于原始文本重新渲染以保持一致性（保留滚动位置）
-        if getattr(self, "_current_raw_content", None) is not None:
-            html = process_chapter_content_for_display(
-                self._current_raw_content,
-                self.settings.get("font_family", DEFAULT_SETTINGS["font_family"]),
-                self.settings.get("font_size", 22),
-                self.settings.get("line_height", 1.6),
-                self.settings.get("night_mode", False),
-                self.settings.get("text_color", DEFAULT_SETTINGS["text_color"])
-            )
-            self.render_html(html, reset_scroll=False)
+        # 夜间模式切换后，基于原始文本重新渲染以保持一致性（保留滚动位置）。
+        # apply_night_mode 已禁用整窗更新并推迟到下一事件循环恢复，此处的重渲染落在同一窗口内，
+        # 样式表切换与正文刷新合并为一次重绘
+        if self._current_raw_content is not None:
+            html = self._chapter_html(self._current_raw_content, self._current_chapter_idx)
+            self.render_html(html, reset_scroll=False, wrapped=True)
 
     def apply_night_mode(self, on):
+        # 与当前已应用的样式表相同则跳过：setStyleSheet 会重新解析 QSS 并重新 polish 所有子控件
+        qss = DARK_STYLE if on else LIGHT_STYLE
+        if qss is self._applied_qss:
+            return
         # 切换样式前短暂禁用更新，减少整窗重绘引起的闪烁
         try:
             self.setUpdatesEnabled(False)
-            if on:
-                self.setStyleSheet(DARK_STYLE)
-            else:
-                self.setStyleSheet(LIGHT_STYLE)
+            self.setStyleSheet(qss)
+            self._applied_qss = qss
         finally:
             # 在下一事件循环恢复更新，避免中途多次刷新
             QTimer.singleShot(0, lambda: self.setUpdatesEnabled(True))
 
+    def _on_book_dir_removed(self, ok, error):
+        """缓存目录删除任务完成后再提示结果（失败时提示手动删除）"""
+        if ok:
+            QMessageBox.information(self, "删除成功", "书籍已成功删除")
+        else:
+            logging.warning(f"删除缓存目录失败: {error}")
+            QMessageBox.warning(self, "删除失败", f"书籍已从书库移除，但无法删除缓存目录，请手动删除: {error}")
+
     def remove_selected_book(self):
         current_item = self.book_select.currentItem()
         if not current_item:
@@ -1107,141 +1412,153 @@ class NovelReaderSidebarFixed(QMainWindow):
         logging.info(f"请求删除书籍: bid={bid}, 标题='{meta.get('title','未知书籍')}'")
         # English: remove book requested
         # logging.info(f"remove book requested: bid={bid}, title='{meta.get('title','未知书籍')}'")
-        # 删除书籍缓存目录
-        book_dir_path = Path(meta.get("book_dir"))
-        if book_dir_path.exists() and book_dir_path.is_dir():
-            try:
-                shutil.rmtree(book_dir_path)
-            except Exception as e:
-                QMessageBox.warning(self, "删除失败", f"无法删除缓存目录: {str(e)}")
-                return
-
-        # 从库中删除书籍
+        # 从库中删除书籍（连同内存中的章节缓存）
+        for key in [k for k in self._chapter_data_cache if k[0] == bid]:
+            del self._chapter_data_cache[key]
         del self.library[bid]
-        save_json(LIB_FILE, self.library)
+        if self.positions.pop(bid, None) is not None:
+            self._mark_dirty(positions=True)
+        self._save_library()
         
         # 刷新书籍列表
         self.refresh_book_select_list()
         
         # 清空当前显示
         if self.current_book_id == bid:
+            self._cancel_chapter_fetches()
+            self._cancel_prefetches()
             self.current_book_id = None
             self.current_chapters = []
             self.current_book_dir = None
-            self.chapter_list.clear()
+            self._chapters_cache_dir = None
+            self.chapter_model.set_chapters([])
+            self._chapter_list_signature = None
             self.text_browser.clear()
+            self._rendered_key = None
             self.title_label.setText("未打开书")
             self.update_navigation_buttons()
         
         logging.info(f"书籍已删除: bid={bid}, 标题='{meta.get('title','未知书籍')}'")
         # English: book removed
         # logging.info(f"book removed: bid={bid}, title='{meta.get('title','未知书籍')}'")
-        QMessageBox.information(self, "删除成功", "书籍已成功删除")
+
+        # 缓存目录在线程池中删除，文件较多时界面不被阻塞；删除结果在任务完成后由 _on_book_dir_removed 提示
+        book_dir = meta.get("book_dir")
+        if book_dir:
+            task = RemoveDirRunnable(book_dir)
+            task.signals.finished.connect(self._on_book_dir_removed)
+            self._pool.start(task)
+        else:
+            QMessageBox.information(self, "删除成功", "书籍已成功删除")
 
     def _show_progress_dialog(self, message, title):
-        """显示进度弹窗"""
+        """显示进度弹窗（首次使用时创建，之后复用同一实例，只更新文字）"""
         try:
-            # 先清理旧的弹窗
-            self._close_progress_dialog()
-            
-            self.progress_dialog = QProgressDialog(message, "", 0, 0, self)
-            self.progress_dialog.setWindowTitle(title)
-            self.progress_dialog.setWindowModality(Qt.WindowModality.NonModal)
-            self.progress_dialog.setCancelButton(None)
-            self.progress_dialog.setAutoClose(False)
-            self.progress_dialog.setAutoReset(False)
-            self.progress_dialog.show()
+            dialog = self.progress_dialog
+            if dialog is None:
+                dialog = self.progress_dialog = QProgressDialog("", "", 0, 0, self)
+                dialog.setWindowModality(Qt.WindowModality.NonModal)
+                dialog.setCancelButton(None)
+                dialog.setAutoClose(False)
+                dialog.setAutoReset(False)
+            dialog.setLabelText(message)
+            dialog.setWindowTitle(title)
+            dialog.show()
         except Exception:
             pass
 
     def _close_progress_dialog(self):
-        """关闭并清理进度弹窗"""
-        if hasattr(self, 'progress_dialog') and self.progress_dialog:
-            try:
-                self.progress_dialog.close()
-                self.progress_dialog.deleteLater()
-            except Exception:
-                pass
-            finally:
-                self.progress_dialog = None
+        """隐藏进度弹窗（保留实例供下次复用）"""
+        if self.progress_dialog:
+            self.progress_dialog.hide()
 
     def _populate_chapter_list_optimized(self):
-        """优化的章节列表填充方法，处理大量章节时避免内存泄漏"""
-        self.chapter_list.setUpdatesEnabled(False)
-        self.chapter_list.clear()
-        
-        chapter_count = len(self.current_chapters)
-        
-        if chapter_count > 2000:
-            self._populate_large_chapter_list(chapter_count)
-        else:
-            self._populate_standard_chapters()
-        
-        self.chapter_list.setUpdatesEnabled(True)
-        self.status.showMessage(f"已加载 {chapter_count} 章节", 3000)
-
-    def _populate_large_chapter_list(self, chapter_count):
-        """处理大量章节的分批加载"""
-        self.status.showMessage(f"正在加载 {chapter_count} 章节，请稍候...", 5000)
-        batch_size = 200
-        
-        for i in range(0, chapter_count, batch_size):
-            batch_end = min(i + batch_size, chapter_count)
-            batch_chapters = self.current_chapters[i:batch_end]
-            
-            # 批量创建并添加项目
-            for ch in batch_chapters:
-                display = f"{ch.get('index', '?')}. {ch.get('title') or ''}"
-                item = QListWidgetItem(display)
-                item.setData(Qt.UserRole, ch.get('index'))
-                self.chapter_list.addItem(item)
-            
-            QApplication.processEvents()
-            
-            # 更新进度
-            progress = int((batch_end / chapter_count) * 100)
-            self.status.showMessage(f"加载章节进度: {progress}% ({batch_end}/{chapter_count})", 1000)
-            
-            # 定期垃圾回收
-            if i % 1000 == 0:
-                import gc
-                gc.collect()
-
-    def _populate_standard_chapters(self):
-        """处理标准数量章节的加载"""
-        for ch in self.current_chapters:
-            display = f"{ch.get('index', '?')}. {ch.get('title') or ''}"
-            item = QListWidgetItem(display)
-            item.setData(Qt.UserRole, ch.get('index'))
-            self.chapter_list.addItem(item)
+        """章节列表填充：模型直接引用 current_chapters，视图按需取可见行，无需逐项创建"""
+        chapters = self.current_chapters
+        # 重新打开同一本书（章节列表对象未变）时保留现有模型，不做重置
+        signature = (
+            self.current_book_id, id(chapters), len(chapters),
+            chapters[0].get("index") if chapters else None,
+            chapters[-1].get("index") if chapters else None,
+        )
+        if signature != self._chapter_list_signature:
+            self._chapter_list_signature = signature
+            self.chapter_model.set_chapters(chapters)
+        self.status.showMessage(f"已加载 {len(self.current_chapters)} 章节", 3000)
 
     def _on_chapter_batch_ready(self, batch_chapters, current_count, total_estimated):
         """处理章节批次数据（用于大量章节的实时反馈）"""
         try:
-            if hasattr(self, 'progress_dialog') and self.progress_dialog:
+            if self.progress_dialog and self.progress_dialog.isVisible():
                 progress_pct = int((current_count / total_estimated) * 100) if total_estimated > 0 else 0
                 self.progress_dialog.setLabelText(f"正在处理章节: {current_count}/{total_estimated} ({progress_pct}%)")
         except Exception:
             pass
 
+    def _mark_dirty(self, settings=False, library=False, positions=False):
+        """标记设置/书库/阅读位置待保存；尚无待执行的保存时启动保存计时"""
+        if settings:
+            self._settings_dirty = True
+            self._style_cache = None
+        if library:
+            self._library_dirty = True
+        if positions:
+            self._positions_dirty = True
+        # 批量保存而非尾随防抖：已有待执行的保存时不重新计时，连续改动在首次改动后 500ms 统一落盘
+        if not self._save_batch_timer.isActive():
+            self._save_batch_timer.start()
+
+    def _flush_dirty(self):
+        """立即写出所有待保存的数据和缓冲的日志（关闭窗口及应用退出前调用，可重复调用）"""
+        self._save_batch_timer.stop()
+        self._auto_save()
+        # 等待后台写线程把排队的书库写入落盘（写线程为守护线程，进程退出时不会等它）
+        flush_background_saves()
+        flush_app_logger()
+
+    def _save_library(self):
+        """立即保存书库：界面线程只做序列化，写盘交给后台写线程（内容与上次相同时跳过）"""
+        self._saved_digests[LIB_FILE] = save_json_in_background(
+            LIB_FILE, self.library, self._saved_digests.get(LIB_FILE),
+            on_error=self._bg_save_signals.failed.emit)
+        self._library_dirty = False
+
+    def _on_library_save_failed(self, path, error):
+        """后台写书库失败：重新标记为待保存（不立即重试，下次改动或退出时再写），并在状态栏提示"""
+        self._library_dirty = True
+        self.status.showMessage(f"书库保存失败，将在下次保存时重试: {error}", 5000)
+
     def _auto_save(self):
-        """自动保存设置和库"""
+        """自动保存设置、阅读位置和库（无改动时直接返回）"""
+        if not (self._settings_dirty or self._positions_dirty or self._library_dirty):
+            return
         try:
-            if getattr(self, "_settings_dirty", False):
-                save_json(SETTINGS_FILE, self.settings)
+            if self._settings_dirty:
+                self._saved_digests[SETTINGS_FILE] = save_json_if_changed(
+                    SETTINGS_FILE, self.settings, self._saved_digests.get(SETTINGS_FILE))
                 self._settings_dirty = False
-            if getattr(self, "_library_dirty", False):
-                save_json(LIB_FILE, self.library)
-                self._library_dirty = False
+            if self._positions_dirty:
+                self._saved_digests[POSITIONS_FILE] = save_json_if_changed(
+                    POSITIONS_FILE, self.positions, self._saved_digests.get(POSITIONS_FILE))
+                self._positions_dirty = False
+            if self._library_dirty:
+                self._save_library()
                 logging.info("library.json 已保存")
                 # English: library.json saved
                 # logging.info("library.json saved")
         except Exception:
             logging.exception("自动保存失败")
 def main():
+    # QtWebEngine 延迟导入：需在创建 QApplication 之前声明共享 OpenGL 上下文
+    QApplication.setAttribute(Qt.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
     app.setStyle("Fusion")  # 使用Fusion风格，在所有平台上看起来一致
+    # 旧版书籍 ID 迁移放在启动流程中（日志已就绪），导入模块时不改动书库与缓存目录
+    if _migrate_book_ids(library):
+        save_json_if_changed(LIB_FILE, library)
     window = NovelReaderSidebarFixed()
+    # 事件循环退出前落盘待保存数据与缓冲日志，避免留到解释器析构阶段
+    app.aboutToQuit.connect(window._flush_dirty)
     window.show()
     sys.exit(app.exec())
 
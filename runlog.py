@@ -1,5 +1,99 @@
 import logging
-from logging.handlers import RotatingFileHandler
+import threading
+import time
+from logging.handlers import MemoryHandler, RotatingFileHandler
+
+
+class _SizeRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that decides rollover from the open stream's size only.
+    The stock shouldRollover() (Python 3.9+) also stats the log path twice per record
+    to skip non-regular files; the app owns its log file, so that check is dropped.
+    """
+
+    def shouldRollover(self, record):
+        if self.maxBytes <= 0:
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        msg = "%s\n" % self.format(record)
+        self.stream.seek(0, 2)  # non-posix-compliant Windows feature
+        return self.stream.tell() + len(msg) >= self.maxBytes
+
+    def handle_batch(self, records):
+        """Emit several records, flushing the stream once at the end instead of after each record."""
+        self.acquire()
+        try:
+            self._batching = True
+            try:
+                for record in records:
+                    self.handle(record)
+            finally:
+                self._batching = False
+            self.flush()
+        finally:
+            self.release()
+
+    def flush(self):
+        if not getattr(self, "_batching", False):
+            super().flush()
+
+
+class _BufferedLogHandler(MemoryHandler):
+    """
+    Buffers records in memory and hands them to the file handler in batches.
+    A batch is written when the buffer is full, a record at flush_level or above arrives,
+    or flush_interval seconds have passed since the last write. The time bound is checked
+    as records arrive and by a daemon thread, so records left after a burst reach the file
+    within flush_interval even if nothing else is logged; close() stops that thread and
+    writes out anything still buffered (logging.shutdown() calls it at exit).
+    """
+
+    def __init__(self, capacity, flush_level, target, flush_interval=1.0):
+        super().__init__(capacity, flushLevel=flush_level, target=target, flushOnClose=True)
+        self.flush_interval = flush_interval
+        self._last_flush = time.monotonic()
+        self._stop_event = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_loop, name="log-flusher", daemon=True)
+        self._flusher.start()
+
+    def _flush_loop(self):
+        while not self._stop_event.wait(self.flush_interval):
+            if self.buffer and time.monotonic() - self._last_flush >= self.flush_interval:
+                try:
+                    self.flush()
+                except Exception:
+                    pass
+
+    def shouldFlush(self, record):
+        return super().shouldFlush(record) or time.monotonic() - self._last_flush >= self.flush_interval
+
+    def flush(self):
+        self.acquire()
+        try:
+            if self.target is not None and self.buffer:
+                self.target.handle_batch(self.buffer)
+                self.buffer.clear()
+            self._last_flush = time.monotonic()
+        finally:
+            self.release()
+
+    def close(self):
+        self._stop_event.set()
+        super().close()
+
+
+def flush_app_logger() -> None:
+    """
+    Write out any buffered records on the root logger's handlers without closing them.
+    Called when the Qt event loop is about to quit, so the final batch lands on disk
+    before interpreter teardown; logging.shutdown() at exit still runs afterwards.
+    """
+    for h in list(logging.getLogger().handlers):
+        try:
+            h.flush()
+        except Exception:
+            pass
 
 
 def setup_app_logger(log_file: str, *, level: int = logging.INFO, max_bytes: int = 1_048_576, backup_count: int = 3, add_console: bool = False) -> logging.Logger:
@@ -10,6 +104,7 @@ def setup_app_logger(log_file: str, *, level: int = logging.INFO, max_bytes: int
     - max_bytes: rotate after this many bytes (~1MB)
     - backup_count: keep this many rotated files
     - add_console: also log to console if True
+    File output is buffered (up to 1024 records / 1s); WARNING and above are written immediately.
     Returns the app logger.
     """
     logger = logging.getLogger()  # root
@@ -17,15 +112,17 @@ def setup_app_logger(log_file: str, *, level: int = logging.INFO, max_bytes: int
     # Always reconfigure handlers to avoid being blocked by prior/basicConfig
     for h in list(logger.handlers):
         logger.removeHandler(h)
+        if isinstance(h, _BufferedLogHandler):
+            h.close()  # flush and stop its flusher thread
 
     logger.setLevel(level)
 
     # Rotating file handler (no delay to write immediately)
-    fh = RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=False)
+    fh = _SizeRotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=False)
     fh.setLevel(level)
     fmt = logging.Formatter("%(asctime)s %(levelname)s %(name)s - %(message)s")
     fh.setFormatter(fmt)
-    logger.addHandler(fh)
+    logger.addHandler(_BufferedLogHandler(1024, logging.WARNING, fh))
 
     if add_console:
         ch = logging.StreamHandler()
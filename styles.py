@@ -11,7 +11,7 @@ QWidget {
     color: #d0d0d0; /* 文本颜色 */
 }
 /* 列表组件样式 */
-QListWidget {
+QListView {
     background-color: #2a2a2a; /* 背景颜色 */
     color: #d0d0d0; /* 文本颜色 */
     border: 1px solid #404040; /* 边框 */
@@ -19,16 +19,16 @@ QListWidget {
     selection-background-color: #4a4a4a; /* 选中项背景颜色 */
 }
 /* 列表项样式 */
-QListWidget::item {
+QListView::item {
     padding: 8px 12px; /* 内边距 */
     border-bottom: 1px solid #353535; /* 底部边框 */
 }
 /* 列表项悬停样式 */
-QListWidget::item:hover {
+QListView::item:hover {
     background-color: #353535; /* 悬停背景颜色 */
 }
 /* 列表项选中样式 */
-QListWidget::item:selected {
+QListView::item:selected {
     background-color: #4a4a4a; /* 选中背景颜色 */
 }
 /* 按钮样式 */
@@ -135,7 +135,7 @@ QWidget {
     color: #5D4E37; /* 文本颜色 */
 }
 /* 所有列表组件样式 */
-QListWidget {
+QListView {
     background-color: #E6D3A3; /* 背景颜色 */
     color: #800000; /* 文本颜色 */
     border: 1px solid #C19A6B; /* 边框 */
@@ -143,16 +143,16 @@ QListWidget {
     selection-background-color: #DEB887; /* 选中项背景颜色 */
 }
 /* 列表项样式 */
-QListWidget::item {
+QListView::item {
     padding: 8px 12px; /* 内边距 */
     border-bottom: 1px solid #C19A6B; /* 底部边框 */
 }
 /* 列表项悬停样式 */
-QListWidget::item:hover {
+QListView::item:hover {
     background-color: #DEB887; /* 悬停背景颜色 */
 }
 /* 列表项选中样式 */
-QListWidget::item:selected {
+QListView::item:selected {
     background-color: #CD853F; /* 选中背景颜色 */
     color: #FFFFFF; /* 选中文本颜色 */
 }
@@ -249,24 +249,8 @@ QToolBar {
 }
 """
 
-# 直排排版 HTML 包装函数（与主程序一致）
-def wrap_vertical_html(inner_html, font_family, font_size, line_height, night, text_color, bg_color=None):
-    """
-    生成包含直排 CSS 的完整 HTML。
-    参数：
-      - inner_html: 已生成的章节 HTML 片段
-      - font_family: 字体
-      - font_size: 字号（px）
-      - line_height: 行高
-      - night: 是否夜间模式（决定深色背景）
-      - text_color: 文本颜色
-      - bg_color: 背景色（可选；白天模式下优先使用该色）
-    """
-    if bg_color is None:
-        bg = "#121212" if night else "#ffffff"
-    else:
-        bg = "#121212" if night else bg_color
-    return f"""<!doctype html>
+# 直排页面模板（预先定义为常量，渲染时只做 format_map 填充）
+_VWRAP_TEMPLATE = """<!doctype html>
 <meta charset="utf-8">
 <style>
   html,body {{
@@ -291,4 +275,37 @@ def wrap_vertical_html(inner_html, font_family, font_size, line_height, night, t
   }}
   a {{ color: {text_color}; text-decoration: underline; }}
 </style>
-<div class="vwrap">{inner_html}</div>"""
\ No newline at end of file
+<div class="vwrap">{inner_html}</div>"""
+
+# 直排排版 HTML 包装函数（与主程序一致）
+def wrap_vertical_html(inner_html, font_family, font_size, line_height, night, text_color, bg_color=None):
+    """
+    生成包含直排 CSS 的完整 HTML。
+    参数：
+      - inner_html: 已生成的章节 HTML 片段
+      - font_family: 字体
+      - font_size: 字号（px）
+      - line_height: 行高
+      - night: 是否夜间模式（决定深色背景）
+      - text_color: 文本颜色
+      - bg_color: 背景色（可选；白天模式下优先使用该色）
+    """
+    if bg_color is None:
+        bg = "#121212" if night else "#ffffff"
+    else:
+        bg = "#121212" if night else bg_color
+    return _VWRAP_TEMPLATE.format_map({
+        "bg": bg,
+        "text_color": text_color,
+        "font_family": font_family,
+        "font_size": font_size,
+        "line_height": line_height,
+        "inner_html": inner_html,
+    })
+
+# module exports
+__all__ = [
+    "DARK_STYLE",
+    "LIGHT_STYLE",
+    "wrap_vertical_html"
+]
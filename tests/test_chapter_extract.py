@@ -0,0 +1,101 @@
+"""
+章节正文提取：lxml 快速路径与 BeautifulSoup 路径的输出必须一致。
+修改 _extract_chapter_lxml / _lx_strings / _lx_text / _lx_is_removed 后运行：
+    python -m pytest -q tests
+"""
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import analysis_index as ai  # noqa: E402
+
+pytestmark = pytest.mark.skipif(not ai._LXML_AVAILABLE, reason="lxml 未安装")
+
+
+def _both(html, monkeypatch):
+    """分别用 lxml 快速路径和 BeautifulSoup 路径提取，返回 (快速路径结果, bs4 结果)"""
+    monkeypatch.setattr(ai, "_LXML_AVAILABLE", True)
+    fast = ai.extract_title_and_content_from_chapter(html)
+    monkeypatch.setattr(ai, "_LXML_AVAILABLE", False)
+    slow = ai.extract_title_and_content_from_chapter(html)
+    return fast, slow
+
+
+FIXTURES = {
+    "ads": '<html><head><title>第二章_站</title></head><body><div class="nr">行一<br/>  行二  <br/><br/>行三'
+           '<div class="ads">广告</div><p class="advert">推广</p><iframe>框</iframe></div></body></html>',
+    "comments": '<html><body><h1>第3章 标题</h1><div id="content">甲<!-- 注释 -->乙<p>丙<!-- x --></p>'
+                '</div></body></html>',
+    "script_style": '<html><head><title>第一章 开始 - 某书 - 站</title><style>p{}</style></head><body>'
+                    '<div id="content"><script>var a = 1;</script><p>第一段</p><p>  </p><style>.x{}</style>'
+                    '<p>第二段&amp;</p><noscript>无脚本</noscript></div></body></html>',
+    "br_tails": '<html><body><div id="txt">开头<br>尾巴一<br/>\n  尾巴二  <br><b>粗</b>尾巴三<br></div></body></html>',
+    "template_ruby": '<html><body><div class="content"><template>模板</template><ruby>汉<rp>(</rp><rt>han</rt>'
+                     '<rp>)</rp></ruby>字<p>段落</p></div></body></html>',
+    "h1_script": '<html><head><title>单独标题</title></head><body><h1><script>s</script></h1>'
+                 '<div id="chaptercontent" class="content">正文　全角　\xa0内容</div></body></html>',
+    "longest_div": '<html><body><div>' + "长文本" * 60 + '<br>第二行</div><div>短</div></body></html>',
+    "nested_junk_class": '<html><body><div class="chapter-content  extra">正文<div class="nr ads">广告'
+                         '<p>广告内段落</p></div>结尾</div></body></html>',
+    "empty": "",
+    "plain_text": "纯文本",
+}
+
+
+@pytest.mark.parametrize("name", sorted(FIXTURES))
+def test_fixture_pages_match_bs4(name, monkeypatch):
+    fast, slow = _both(FIXTURES[name], monkeypatch)
+    assert fast == slow
+
+
+def test_fast_path_handles_common_pages():
+    # 确保上面的比较确实经过快速路径，而不是两边都回退到 bs4
+    for name in ("ads", "comments", "script_style", "br_tails"):
+        assert ai._extract_chapter_lxml(FIXTURES[name]) is not None, name
+
+
+_TAGS = ["div", "p", "span", "section", "article", "h1", "b", "br", "script", "style", "iframe",
+         "noscript", "template", "ruby", "rt", "rp", "a", "ul", "li", "table", "td", "font"]
+_ATTRS = ['', ' id="content"', ' id="txt"', ' id="nr1"', ' class="content"', ' class="nr ads"',
+          ' class="ads"', ' class="advert"', ' class="paybox"', ' class="chapter-content  extra"',
+          ' class="article"', ' id="chaptercontent" class="content"', ' class="maintext"']
+_WORDS = ["正文", "  第一段  ", "\n", "文字" * 30, "&amp;", "&lt;x&gt;", " ", "广告", "abc\ndef",
+          "　全角空格　", "\xa0", "长" * 130]
+
+
+def _random_fragment(rng, depth):
+    out = []
+    for _ in range(rng.randint(0, 4)):
+        r = rng.random()
+        if r < 0.4 or depth > 5:
+            out.append(rng.choice(_WORDS))
+        elif r < 0.47:
+            out.append("<!-- 注释 " + rng.choice(_WORDS) + " -->")
+        else:
+            tag = rng.choice(_TAGS)
+            if tag == "br":
+                out.append("<br/>")
+                continue
+            out.append(f"<{tag}{rng.choice(_ATTRS)}>{_random_fragment(rng, depth + 1)}</{tag}>")
+    return "".join(out)
+
+
+def _random_page(rng):
+    head = rng.choice(["", "<title>第九章 标题 - 书 - 站</title>", "<title>  </title>",
+                       "<title>单独标题</title>", "<title></title>"])
+    body = _random_fragment(rng, 0)
+    if rng.random() < 0.3:
+        body = rng.choice(["<h1></h1>", "<h1> 第1章 <span>x</span></h1>", "<h1><script>s</script></h1>"]) + body
+    return f"<html><head>{head}</head><body>{body}</body></html>"
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_random_pages_match_bs4(seed, monkeypatch):
+    rng = random.Random(seed)
+    for _ in range(300):
+        html = _random_page(rng)
+        fast, slow = _both(html, monkeypatch)
+        assert fast == slow, html